@@ -1,13 +1,49 @@
+import time
+STARTUP_START = time.perf_counter()  # taken before the other imports so the startup report can time them
 import pygame
 import random
 import sys
 import os
 import asyncio
+import hashlib
+import io
+import json
+import math
+import marshal
+import struct
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+from importlib.util import find_spec
+# NumPy is by far the slowest import, so it is only imported once the array storage is used (see load_numpy)
+np = None
+HAS_NUMPY = find_spec("numpy") is not None
 IS_WEB_BUILD = sys.platform in ("emscripten", "wasi")
 
 # --- Control Center ---
 CANVAS_WIDTH = 1200
 CANVAS_HEIGHT = 800
+# Opt-in renderer that only repaints and presents the regions that changed
+DIRTY_RECT_RENDERING = os.environ.get("RADIANT_DIRTY_RECTS") == "1"
+# Frame profiler overlay and trace dump; PROFILE_TOGGLE_KEY switches it at runtime
+PROFILING = os.environ.get("RADIANT_PROFILE") == "1"
+PROFILE_HISTORY = 300  # frames kept in the profiler's ring buffer
+PROFILE_TRACE_PATH = os.environ.get("RADIANT_PROFILE_TRACE", "radiant_trace.json")
+PROFILE_TOGGLE_KEY = pygame.K_F3
+PROFILE_DUMP_KEY = pygame.K_F4
+PROFILE_OVERLAY_REFRESH = 15  # frames between overlay text updates
+# Print how long each startup phase took, up to the first frame (also --startup-report)
+STARTUP_REPORT = os.environ.get("RADIANT_STARTUP_REPORT") == "1"
+# The playfield is drawn at 1/RENDER_DIVISOR of the canvas resolution (1, 2 or 3) and
+# upscaled to the window with nearest-neighbour scaling; the text screens stay at 1
+try:
+    RENDER_DIVISOR = int(os.environ.get("RADIANT_RENDER_DIVISOR", "1"))
+except ValueError:
+    print("Warning: RADIANT_RENDER_DIVISOR is not a whole number, drawing at full resolution")
+    RENDER_DIVISOR = 1
+RENDER_DIVISOR = max(1, min(3, RENDER_DIVISOR))
+WINDOW_SIZE = (CANVAS_WIDTH, CANVAS_HEIGHT)  # initial size; the window is resizable
 
 # --- General ---
 SIZE = 12
@@ -18,6 +54,8 @@ INTERNAL_SPACE = SIZE + DIVIDER
 NUM_COLS = Q
 NUM_ROWS= Q // 2 + Q // Q  # This evaluates to 3, which works for all levels
 PLAYER_LIVES = 3
+TICK_RATE = 60  # simulation steps per second; one step() call is one tick
+MAX_FRAME_TIME = 0.25  # seconds of real time one frame may catch up on; longer stalls are dropped
 FONT_PATH = "ZenDots-Regular.ttf"
 FONT_PATH_2 = "Exo2-VariableFont_wght.ttf"
 ALPHA = int(255 * 0.26)
@@ -39,13 +77,25 @@ FONT_CONFIG = {
     'story':        (FONT_PATH_2, 24, 1.4),
     'prompt':       (FONT_PATH, 18, 1.0)
 }
+# Glyph atlas baked from FONT_CONFIG by tools/build_assets.py; fonts missing from it load the TTF
+FONT_ATLAS_PATH = "font_atlas.png"
+FONT_METRICS_PATH = "font_atlas.json"
+FONT_ATLAS_VERSION = 1
+# Fonts that only ever show a fixed set of characters; the others get font_charset()
+FONT_GLYPHS = {'screen_title': "RADIANT", 'score': "0123456789"}
 # --- font spacing settings ---
 FONT_SPACING_MAP = {}
+# --- rendered text cache (LRU, bounded by surface memory) ---
+TEXT_CACHE = OrderedDict()
+TEXT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+_text_cache_bytes = 0
 
 # SHIP
 SHIP_MOVE_SPEED = 5
 SHIP_PROJECTILE_SPEED = 10
 SHIP_PROJECTILE_COLOR = COLOR_3
+SHIP_WIDTH = 5 * SIZE
+SHIP_HEIGHT = 4 * SIZE
 
 # DRONE
 DRONE_WIDTH = 5 * SIZE + 4 * DIVIDER
@@ -64,6 +114,10 @@ FLEET_SPACING = SPACE
 FLEET_MOVE_SPEED = 1
 BATTLESHIP_FLEET_GAP = 2 * SIZE
 DEPLOY_SPEED = 10
+# Keep per-tick fleet state in NumPy arrays (see create_fleet_arrays) when available, for
+# fleets of at least ARRAY_FLEET_MIN_DRONES; below that NumPy's per-call cost outweighs it
+USE_ARRAY_FLEET = HAS_NUMPY
+ARRAY_FLEET_MIN_DRONES = 24
 
 
 # --- Scoring System ---
@@ -77,21 +131,24 @@ BATTLESHIP_DESTROY_BONUS = 500
 # --- Font & Text Management ---
 def load_fonts():
     """
-    Reads FONT_CONFIG, loads pygame Font objects, and populates the
-    global FONT_SPACING_MAP to link fonts to their line spacing settings.
+    Reads FONT_CONFIG, loads a BitmapFont from the baked atlas (or a pygame Font from
+    the TTF if it isn't baked), and populates the global FONT_SPACING_MAP to link
+    fonts to their line spacing settings.
     """
     # Clear the map to handle game restarts cleanly
     FONT_SPACING_MAP.clear()
+    clear_text_cache()
+    atlas_fonts = load_font_atlas()
     loaded_fonts = {}
     try:
         for key, (font_path, font_size, line_spacing) in FONT_CONFIG.items():
-            font = pygame.font.Font(font_path, font_size)
+            font = atlas_fonts.get(key) or load_font_file(font_path, font_size)
             loaded_fonts[key] = font
             #  font's unique ID to store its spacing in the global map
             FONT_SPACING_MAP[id(font)] = line_spacing
         return loaded_fonts
 
-    except pygame.error as e:
+    except (pygame.error, OSError) as e:
         print(f"Warning: Font loading error - {e}. Using default 'monospace' fonts for all text.")
         fallback_fonts = {}
         for key, (font_path, font_size, line_spacing) in FONT_CONFIG.items():
@@ -214,6 +271,34 @@ loading…  success   /causality_loop(engaged) """,
 }
 
 
+def clear_text_cache():
+    global _text_cache_bytes
+    TEXT_CACHE.clear()
+    _text_cache_bytes = 0
+
+
+def render_text(font, text, color, antialias=True):
+    """
+    font.render with an LRU cache in front of it. Static screens and the score HUD
+    draw the same strings every frame, so each one is rasterised only once.
+    """
+    global _text_cache_bytes
+    key = (font, text, color if isinstance(color, (str, tuple)) else tuple(color), bool(antialias))
+    surface = TEXT_CACHE.get(key)
+    if surface is not None:
+        TEXT_CACHE.move_to_end(key)
+        return surface
+
+    surface = font.render(text, antialias, color)
+    size_bytes = surface.get_width() * surface.get_height() * surface.get_bytesize()
+    TEXT_CACHE[key] = surface
+    _text_cache_bytes += size_bytes
+    while _text_cache_bytes > TEXT_CACHE_MAX_BYTES and len(TEXT_CACHE) > 1:
+        _, evicted = TEXT_CACHE.popitem(last=False)
+        _text_cache_bytes -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+    return surface
+
+
 def draw_text(screen, text, font, color, position, anchor="center"):
     # --- NEW: Check if the input text is a list or a string ---
     if isinstance(text, list):
@@ -242,7 +327,7 @@ def draw_text(screen, text, font, color, position, anchor="center"):
         if not clean_line:  # Don't render empty lines, just advance the space
             continue
 
-        text_surface = font.render(clean_line, True, color)
+        text_surface = render_text(font, clean_line, color)
         text_rect = text_surface.get_rect()
 
         # We handle the y-positioning manually, but respect the x-anchor
@@ -257,171 +342,1021 @@ def draw_text(screen, text, font, color, position, anchor="center"):
         screen.blit(text_surface, text_rect)
 
 
-async def run_scrolling_text_animation(screen, clock, fonts, text_lines, scroll_speed=1, player_info=None):
+# --- Bitmap Fonts ---
+# Every FONT_CONFIG entry is baked ahead of time into one packed glyph atlas image plus
+# metrics (advance widths and kerning pairs), so startup doesn't parse the TTFs and a
+# string is composed by blitting its glyphs out of the atlas.
+def font_charset():
+    """The characters baked for every font: printable ASCII and whatever else the game's texts use."""
+    texts = [STORY_TEXTS, SCREEN_TEXT]
+    chars = {chr(code) for code in range(32, 127)}
+    while texts:
+        text = texts.pop()
+        if isinstance(text, dict):
+            texts.extend(text.values())
+        elif isinstance(text, list):
+            texts.extend(text)
+        else:
+            chars.update(text)
+    return ''.join(sorted(c for c in chars if c.isprintable()))
 
-    line_height = fonts['story'].get_height() * 1.6
-    total_height = int(len(text_lines) * line_height)
-    text_surface = pygame.Surface((CANVAS_WIDTH, total_height), pygame.SRCALPHA)
 
-    for i, line in enumerate(text_lines):
-        text_render = fonts['level_start'].render(line, 1, COLOR_2)
-        text_rect = text_render.get_rect(center=(CANVAS_WIDTH / 2, i * line_height + line_height / 2))
-        text_surface.blit(text_render, text_rect)
+class BitmapFont:
+    """
+    The part of the pygame.font.Font interface the game uses, drawn from a baked glyph
+    atlas. Strings with a character the atlas lacks (e.g. a typed name) go to the TTF,
+    which is only loaded the first time that happens.
+    """
 
-    surface_y = CANVAS_HEIGHT
-    scrolling = True
-    while scrolling:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                scrolling = False
+    def __init__(self, atlas, metrics, font_path, font_size):
+        # char -> (glyph image cropped to its ink, or None for blanks, its offset, advance width)
+        self.glyphs = {}
+        for char, (x, y, width, height, offset_x, offset_y, advance) in metrics['glyphs'].items():
+            image = atlas.subsurface((x, y, width, height)) if width and height else None
+            self.glyphs[char] = (image, (offset_x, offset_y), advance)
+        self.kerning = metrics['kerning']
+        self.height, self.linesize = metrics['height'], metrics['linesize']
+        self.ascent, self.descent = metrics['ascent'], metrics['descent']
+        self.font_path, self.font_size = font_path, font_size
+        self.ttf = None
+
+    def _ttf(self):
+        if self.ttf is None:
+            self.ttf = load_font_file(self.font_path, self.font_size)
+        return self.ttf
+
+    def _layout(self, text):
+        """x of each glyph and the total width, or None if a glyph is missing."""
+        glyphs, kerning = self.glyphs, self.kerning
+        if any(char not in glyphs for char in text):
+            return None
+        xs, x = [], 0
+        for i, char in enumerate(text):
+            if i:
+                x += glyphs[text[i - 1]][2] + kerning.get(text[i - 1:i + 1], 0)
+            xs.append(x)
+        return xs, (x + glyphs[text[-1]][2] if text else 0)
+
+    def size(self, text):
+        layout = self._layout(text)
+        if layout is None:
+            return self._ttf().size(text)
+        return layout[1], self.height
+
+    def render(self, text, antialias, color, background=None):
+        layout = self._layout(text)
+        if layout is None:
+            return self._ttf().render(text, antialias, color, background)
+        xs, width = layout
+        surface = pygame.Surface((width, self.height), pygame.SRCALPHA)
+        for char, x in zip(text, xs):
+            image, (offset_x, offset_y), _ = self.glyphs[char]
+            if image is not None:
+                surface.blit(image, (x + offset_x, offset_y), special_flags=pygame.BLEND_RGBA_MAX)
+        # Glyphs are baked white, so tinting is a multiply
+        surface.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+        if background is not None:
+            opaque = pygame.Surface(surface.get_size())
+            opaque.fill(background)
+            opaque.blit(surface, (0, 0))
+            return opaque
+        return surface
+
+    def get_height(self):
+        return self.height
+
+    def get_linesize(self):
+        return self.linesize
+
+    def get_ascent(self):
+        return self.ascent
+
+    def get_descent(self):
+        return self.descent
+
+
+def load_font_atlas():
+    """BitmapFonts by FONT_CONFIG key for the entries the atlas was baked from. Empty if there is no atlas."""
+    try:
+        metrics = json.loads(read_asset(FONT_METRICS_PATH))
+        if metrics.get('version') != FONT_ATLAS_VERSION:
+            raise ValueError(f"{FONT_METRICS_PATH} is not a version {FONT_ATLAS_VERSION} font atlas")
+        atlas = pygame.image.load(io.BytesIO(read_asset(FONT_ATLAS_PATH)), FONT_ATLAS_PATH)
+    except (OSError, ValueError, pygame.error) as e:
+        print(f"Warning: No font atlas, loading the TTF fonts instead. Run tools/build_assets.py. Error: {e}")
+        return {}
+
+    fonts = {}
+    for key, (font_path, font_size, _) in FONT_CONFIG.items():
+        font_metrics = metrics['fonts'].get(key)
+        # An entry baked from a different file or size is stale; that font falls back to its TTF
+        if font_metrics and font_metrics['source'] == [font_path, font_size]:
+            fonts[key] = BitmapFont(atlas, font_metrics, font_path, font_size)
+    return fonts
+
+
+def load_font_file(font_path, font_size):
+    return pygame.font.Font(io.BytesIO(read_asset(font_path)), font_size)
+
+
+# --- Profiler ---
+# Off unless RADIANT_PROFILE=1 or toggled with PROFILE_TOGGLE_KEY. While on, sections of
+# each frame (input, ticks, the subsystems inside step(), drawing, flip) are timed into
+# a ring buffer that feeds the overlay and can be dumped as a Chrome trace.
+_UNPROFILED = nullcontext()
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, history=PROFILE_HISTORY):
+        self.enabled = enabled
+        self.frames = deque(maxlen=history)
+        self.spans = []
+        self.frame_start = None
+        self.origin = time.perf_counter()
+
+    def section(self, name):
+        """Context manager timing one named span of the current frame (a no-op while disabled)."""
+        return self._record(name) if self.enabled else _UNPROFILED
+
+    @contextmanager
+    def _record(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, start, time.perf_counter() - start))
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+        self.spans = []
+
+    def end_frame(self, counts=None):
+        if not self.enabled or self.frame_start is None:
+            return
+        self.frames.append({'start': self.frame_start, 'duration': time.perf_counter() - self.frame_start,
+                            'spans': self.spans, 'counts': counts or {}})
+
+    def summary(self):
+        """Frame rate, mean and p95 frame work time, and mean ms per frame for each section."""
+        frames = list(self.frames)
+        if len(frames) < 2:
+            return None
+        durations = sorted(frame['duration'] for frame in frames)
+        section_totals = {}
+        for frame in frames:
+            for name, _, duration in frame['spans']:
+                section_totals[name] = section_totals.get(name, 0.0) + duration
+        return {
+            'fps': (len(frames) - 1) / max(frames[-1]['start'] - frames[0]['start'], 1e-9),
+            'mean_ms': 1000 * sum(durations) / len(durations),
+            'p95_ms': 1000 * durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+            'sections_ms': {name: 1000 * total / len(frames) for name, total in section_totals.items()},
+            'counts': frames[-1]['counts'],
+        }
+
+    def write_trace(self, path):
+        """Writes the ring buffer in Chrome's trace event format (chrome://tracing, Perfetto)."""
+        micros = lambda seconds: round(seconds * 1e6, 1)
+        events = []
+        for frame in self.frames:
+            events.append({'name': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': micros(frame['start'] - self.origin), 'dur': micros(frame['duration'])})
+            events.extend({'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': micros(start - self.origin), 'dur': micros(duration)}
+                          for name, start, duration in frame['spans'])
+            if frame['counts']:
+                events.append({'name': 'entities', 'ph': 'C', 'pid': 1, 'tid': 1,
+                               'ts': micros(frame['start'] - self.origin), 'args': frame['counts']})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+PROFILER = FrameProfiler(PROFILING)
+
+
+def render_profiler_overlay(font, summary):
+    lines = [f"{summary['fps']:.0f} fps   frame {summary['mean_ms']:.2f} ms   p95 {summary['p95_ms']:.2f} ms"]
+    lines += [f"{name:<24}{ms:7.3f} ms" for name, ms in
+              sorted(summary['sections_ms'].items(), key=lambda item: item[1], reverse=True)]
+    lines += [f"{name:<24}{count:>7}" for name, count in summary['counts'].items()]
+
+    line_height = font.get_linesize()
+    surfaces = [font.render(line, True, COLOR_2) for line in lines]
+    overlay = pygame.Surface((max(s.get_width() for s in surfaces) + SIZE, len(lines) * line_height + SIZE))
+    overlay.fill(COLOR_1)
+    for i, surface in enumerate(surfaces):
+        overlay.blit(surface, (SIZE / 2, SIZE / 2 + i * line_height))
+    return overlay
+
+
+# --- Startup ---
+# main() brings up only the display and font modules (pygame.init() would also start
+# audio, joysticks and the rest, none of which the game uses) and times each phase of
+# startup, back to back, until the first frame is presented. Work the first frame
+# doesn't need is handed to FrameScheduler.defer() and runs one task per frame after it.
+def process_age():
+    """Seconds since the process started, from /proc (so Linux only, and to 1/100 s), or None."""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupTimer:
+    def __init__(self, start=STARTUP_START):
+        age = process_age()
+        # The interpreter's own startup, before this module began importing
+        self.interpreter = None if age is None else max(0.0, age - (time.perf_counter() - start))
+        self.phases = []  # (name, seconds), back to back from start to the first frame
+        self.deferred = []  # (name, seconds) of the tasks run after it
+        self.last = start
+        self.first_frame_done = False
+
+    def mark(self, name):
+        """Ends the phase called name, which began where the previous one ended."""
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def report(self):
+        total = sum(seconds for _, seconds in self.phases) + (self.interpreter or 0.0)
+        lines = [f"startup: {total * 1000:.1f} ms from process start to the first frame"]
+        if self.interpreter is not None:
+            lines.append(f"  {'interpreter':<16}{self.interpreter * 1000:8.1f} ms")
+        lines += [f"  {name:<16}{seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        if self.deferred:
+            lines.append("deferred until after the first frame:")
+            lines += [f"  {name:<16}{seconds * 1000:8.1f} ms" for name, seconds in self.deferred]
+        return "\n".join(lines)
+
+
+# --- Frame Scheduler ---
+class Scene:
+    """
+    One screen of the game, run by FrameScheduler. update() advances it by one fixed tick
+    of 1/tick_rate seconds; draw() paints the current frame and returns the rects to
+    present (None for the whole screen, [] if nothing changed). Setting `done` ends the
+    scene and `result` is what FrameScheduler.run() returns. draw() gets a framebuffer
+    at 1/render_divisor of the canvas resolution.
+    """
+    tick_rate = 60
+    render_divisor = 1
 
-        surface_y -= scroll_speed
-        if surface_y < -total_height:
-            scrolling = False
+    def __init__(self):
+        self.done = False
+        self.result = None
 
-        screen.fill(COLOR_1)
-        screen.blit(text_surface, (0, surface_y))
+    def handle_event(self, event):
+        pass
 
-        if player_info:
+    def update(self):
+        pass
+
+    def draw(self, screen):
+        return []
 
-            draw_lives(screen, player_info['lives'])
-            draw_score(screen, fonts['score'], player_info['score'], player_info['total_points'])
+    def invalidate(self):
+        """Forgets what was presented, so the next draw() repaints the whole screen."""
 
-        pygame.display.flip()
+    def profile_counts(self):
+        """Entity counts shown by the profiler overlay."""
+        return {}
 
-        # universal frame rate control
-        if IS_WEB_BUILD:
-            await asyncio.sleep(0)
+
+class FrameScheduler:
+    """
+    Owns frame timing for every scene. Real elapsed time is added to an accumulator and
+    spent in fixed ticks, so scenes run at the same speed whatever the display's refresh
+    rate; a scene is drawn at most once per frame, and only after it ticked. Between
+    frames the scheduler sleeps until the next tick is due instead of spinning.
+
+    The canvas is shown in the window scaled to fit, by a whole factor whenever the
+    window is at least canvas-sized, with bars around it. A scene at full resolution
+    draws straight into that part of the window; one with a render_divisor draws into a
+    smaller framebuffer that is upscaled into it in one nearest-neighbour scale.
+    """
+
+    def __init__(self, window, profiler=PROFILER, startup=None):
+        self.window = window
+        self.view = None  # (window rect the canvas is shown in, canvas-to-window factor)
+        self.canvas_view = None  # that part of the window, when it is shown unscaled
+        self.framebuffers = {}  # render divisor -> surface
+        self.profiler = profiler
+        self.startup = startup
+        self.deferred = deque()  # (name, task) run one per frame once a frame is out
+        self.overlay = None
+        self.overlay_font = None
+        self.frames_since_overlay = 0
+
+    def layout(self):
+        self.window = pygame.display.get_surface()
+        width, height = self.window.get_size()
+        fit = min(width / CANVAS_WIDTH, height / CANVAS_HEIGHT)
+        if fit >= 1:
+            fit = int(fit)
+        size = (int(CANVAS_WIDTH * fit), int(CANVAS_HEIGHT * fit))
+        view = pygame.Rect(((width - size[0]) // 2, (height - size[1]) // 2), size)
+        self.view = (view, fit)
+        if fit != 1:
+            self.canvas_view = None
         else:
-            clock.tick(30)
+            self.canvas_view = self.window if view.size == (width, height) else self.window.subsurface(view)
+        self.window.fill(COLOR_1)
+
+    def framebuffer(self, scene):
+        """The surface scene draws into: the window itself (or its canvas part) when no scaling is needed."""
+        divisor = scene.render_divisor
+        if divisor == 1 and self.canvas_view is not None:
+            return self.canvas_view
+        framebuffer = self.framebuffers.get(divisor)
+        if framebuffer is None:
+            # Rounded up, so the whole canvas is covered where it doesn't divide by the divisor
+            framebuffer = self.framebuffers[divisor] = pygame.Surface(
+                (-(-CANVAS_WIDTH // divisor), -(-CANVAS_HEIGHT // divisor))).convert()
+        return framebuffer
+
+    def present(self, framebuffer, rects):
+        """
+        Copies the drawn rects of framebuffer into the window and returns them in window
+        pixels, the same as Scene.draw() (None for the whole window).
+        """
+        view, fit = self.view
+        if framebuffer is self.canvas_view:
+            return None if rects is None else [rect.move(view.topleft) for rect in rects]
+
+        factor = fit * CANVAS_WIDTH / framebuffer.get_width()
+        if factor != int(factor):
+            # A window smaller than the canvas, where no whole factor fits
+            scale = pygame.transform.smoothscale if factor < 1 else pygame.transform.scale
+            size = (round(framebuffer.get_width() * factor), round(framebuffer.get_height() * factor))
+            if size == view.size:
+                scale(framebuffer, view.size, self.window.subsurface(view))
+            else:
+                # The framebuffer's last row reaches past the canvas; the view cuts it off
+                self.window.subsurface(view).blit(scale(framebuffer, size), (0, 0))
+            return None
+        factor = int(factor)
+        presented = []
+        for rect in [framebuffer.get_rect()] if rects is None else rects:
+            rect = rect.clip(framebuffer.get_rect())
+            if rect.width and rect.height:
+                presented.append(self.upscale(framebuffer, rect, factor))
+        return None if rects is None else presented
+
+    def upscale(self, framebuffer, rect, factor):
+        """
+        Scales rect of framebuffer by a whole factor into its place in the view. Returns that
+        window rect, clipped to the view: where the canvas doesn't divide by the render
+        divisor, the framebuffer's last row (or column) only partly fits in it.
+        """
+        view, _ = self.view
+        # Split off that last row and column. Scaled nearest-neighbour into the part of the
+        # view that's left, a single row of pixels comes out the same as cut off.
+        split_x = min(max(view.width // factor, rect.x), rect.right)
+        split_y = min(max(view.height // factor, rect.y), rect.bottom)
+        for left, right in ((rect.x, split_x), (split_x, rect.right)):
+            for top, bottom in ((rect.y, split_y), (split_y, rect.bottom)):
+                target = pygame.Rect(view.x + left * factor, view.y + top * factor,
+                                     (right - left) * factor, (bottom - top) * factor).clip(view)
+                if target.width and target.height:
+                    pygame.transform.scale(framebuffer.subsurface((left, top, right - left, bottom - top)),
+                                           target.size, self.window.subsurface(target))
+        return pygame.Rect(view.x + rect.x * factor, view.y + rect.y * factor,
+                           rect.width * factor, rect.height * factor).clip(view)
+
+    def defer(self, name, task):
+        """Runs task() after a later frame has been presented, so it doesn't hold up that frame."""
+        self.deferred.append((name, task))
+
+    def run_deferred(self):
+        name, task = self.deferred.popleft()
+        start = time.perf_counter()
+        with self.profiler.section(name):
+            task()
+        startup = self.startup
+        if startup is not None:
+            startup.deferred.append((name, time.perf_counter() - start))
+            if not self.deferred and STARTUP_REPORT:
+                print(startup.report(), flush=True)
+
+    def handle_profiler_key(self, scene, key):
+        if key == PROFILE_TOGGLE_KEY:
+            self.profiler.enabled = not self.profiler.enabled
+            self.profiler.frames.clear()
+            self.overlay = None
+            scene.invalidate()  # repaint whatever the overlay covered
+        elif key == PROFILE_DUMP_KEY and self.profiler.frames:
+            try:
+                count = self.profiler.write_trace(PROFILE_TRACE_PATH)
+                print(f"Wrote {count} trace events to {PROFILE_TRACE_PATH}")
+            except OSError as e:
+                print(f"Warning: Could not write the profiler trace to {PROFILE_TRACE_PATH}. Error: {e}")
+
+    def draw_overlay(self, scene):
+        self.frames_since_overlay += 1
+        if self.overlay is None or self.frames_since_overlay >= PROFILE_OVERLAY_REFRESH:
+            summary = self.profiler.summary()
+            if summary is None:
+                return []
+            if self.overlay_font is None:
+                self.overlay_font = pygame.font.Font(None, 20)
+            summary['counts'] = scene.profile_counts()
+            self.overlay = render_profiler_overlay(self.overlay_font, summary)
+            self.frames_since_overlay = 0
+        view, _ = self.view
+        return [self.window.blit(self.overlay, (view.right - self.overlay.get_width() - SIZE, view.top + SIZE))]
+
+    async def run(self, scene):
+        profiler = self.profiler
+        tick_time = 1 / scene.tick_rate
+        accumulator = tick_time  # tick and draw on the very first frame
+        last_time = time.perf_counter()
+        if self.view is None or scene.render_divisor != 1 or self.view[0].size != self.window.get_size():
+            self.layout()  # clears what the last scene left in the bars
+        while not scene.done:
+            profiler.begin_frame()
+            with profiler.section('input'):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit()
+                    if event.type == pygame.VIDEORESIZE:
+                        self.layout()
+                        scene.invalidate()
+                        continue
+                    if event.type == pygame.KEYDOWN and event.key in (PROFILE_TOGGLE_KEY, PROFILE_DUMP_KEY):
+                        self.handle_profiler_key(scene, event.key)
+                        continue
+                    scene.handle_event(event)
+
+            if asset_bundle_busy():
+                with profiler.section('assets'):
+                    pump_asset_bundle()
+
+            now = time.perf_counter()
+            # Long stalls (a hitch, a throttled background tab) are dropped rather than replayed
+            accumulator += min(now - last_time, MAX_FRAME_TIME)
+            last_time = now
+            ticked = False
+            while accumulator >= tick_time and not scene.done:
+                with profiler.section('tick'):
+                    scene.update()
+                accumulator -= tick_time
+                ticked = True
+
+            if ticked:
+                with profiler.section('draw'):
+                    framebuffer = self.framebuffer(scene)
+                    rects = scene.draw(framebuffer)
+                if rects != [] and framebuffer is not self.window:
+                    with profiler.section('upscale'):
+                        rects = self.present(framebuffer, rects)
+                if profiler.enabled:
+                    with profiler.section('overlay'):
+                        overlay_rects = self.draw_overlay(scene)
+                        if rects is not None:
+                            rects = rects + overlay_rects
+                with profiler.section('flip'):
+                    if rects is None:
+                        pygame.display.flip()
+                    elif rects:
+                        pygame.display.update(rects)
+                if self.startup is not None and not self.startup.first_frame_done:
+                    self.startup.mark('first frame')
+                    self.startup.first_frame_done = True
+                    if not self.deferred and STARTUP_REPORT:
+                        print(self.startup.report(), flush=True)
+                elif self.deferred:
+                    self.run_deferred()
+                profiler.end_frame(scene.profile_counts() if profiler.enabled else None)
+            # Time spent drawing since last_time counts towards the next tick too
+            await asyncio.sleep(max(0.0, tick_time - accumulator - (time.perf_counter() - last_time)))
+        return scene.result
+
+
+class ScrollingTextScene(Scene):
+    """
+    Scrolls a story up the screen. Lines are rendered lazily into a small ring of
+    fixed-height tiles covering the viewport and the tile just below it; tiles that
+    scroll off the top are recycled, so memory stays the same however long the story is.
+    """
+    tick_rate = 30
+    tile_height = 128
+
+    def __init__(self, fonts, text_lines, scroll_speed=1, player_info=None):
+        super().__init__()
+        self.fonts = fonts
+        self.text_lines = text_lines
+        self.scroll_speed = scroll_speed
+
+        self.line_height = fonts['story'].get_height() * 1.6
+        self.total_height = int(len(text_lines) * self.line_height)
+        self.num_tiles = -(-self.total_height // self.tile_height)
+        self.tiles = {}  # tile index -> surface
+        self.free_tiles = []
+
+        # The HUD doesn't change while the story runs, so it is baked once
+        self.hud = []
+        if player_info:
+            lives_layer = render_lives(player_info['lives'])
+            if lives_layer:
+                self.hud.append(lives_layer)
+            self.hud.append(_score_label(fonts['score'], player_info['score'], player_info['total_points']))
+
+        self.surface_y = CANVAS_HEIGHT
+        self.presented_y = None
+        self.scrolling = True
+        # Hold the last frame for half a second once the text is gone or skipped
+        self.hold_ticks = self.tick_rate // 2
+        self.update_tiles()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.scrolling = False
+
+    def invalidate(self):
+        self.presented_y = None
+
+    def render_tile(self, tile_index):
+        tile = self.free_tiles.pop() if self.free_tiles else \
+            pygame.Surface((CANVAS_WIDTH, self.tile_height), pygame.SRCALPHA)
+        tile.fill((0, 0, 0, 0))
+        tile_top = tile_index * self.tile_height
+        # One line of margin either side for glyphs reaching past their line
+        first_line = max(0, int(tile_top // self.line_height) - 1)
+        last_line = min(len(self.text_lines) - 1, int((tile_top + self.tile_height) // self.line_height) + 1)
+        for i in range(first_line, last_line + 1):
+            text_render = render_text(self.fonts['level_start'], self.text_lines[i], COLOR_2)
+            text_rect = text_render.get_rect(center=(CANVAS_WIDTH / 2, i * self.line_height + self.line_height / 2))
+            tile.blit(text_render, text_rect.move(0, -tile_top))
+        return tile
+
+    def update_tiles(self):
+        """Keeps the tiles covering the viewport and the next one below it; recycles the rest."""
+        view_top = -self.surface_y
+        first = max(0, view_top // self.tile_height)
+        # The tile holding the viewport's bottom row, then the one after it
+        last = min(self.num_tiles - 1, (view_top + CANVAS_HEIGHT - 1) // self.tile_height + 1)
+        for tile_index in [index for index in self.tiles if not first <= index <= last]:
+            self.free_tiles.append(self.tiles.pop(tile_index))
+        for tile_index in range(first, last + 1):
+            if tile_index not in self.tiles:
+                self.tiles[tile_index] = self.render_tile(tile_index)
+
+    def update(self):
+        if not self.scrolling:
+            self.hold_ticks -= 1
+            self.done = self.hold_ticks <= 0
+            return
+
+        self.surface_y -= self.scroll_speed
+        if self.surface_y < -self.total_height:
+            self.scrolling = False
+        self.update_tiles()
+
+    def draw(self, screen):
+        if self.surface_y == self.presented_y:
+            return []
+        self.presented_y = self.surface_y
 
+        screen.fill(COLOR_1)
+        for tile_index, tile in self.tiles.items():
+            screen.blit(tile, (0, self.surface_y + tile_index * self.tile_height))
+        for layer, rect in self.hud:
+            screen.blit(layer, rect)
+        return None
+
+# --- Cover Image ---
+# tools/build_assets.py stores the cover pre-scaled to the canvas as a zlib stream of raw
+# RGB rows. That is inflated a chunk per tick behind a placeholder frame, instead of
+# decoding the full-size PNG and scaling it before the first frame. The PNG (a build input,
+# kept in ASSET_SOURCE_DIR out of the web build) is the desktop fallback.
+COVER_IMAGE_PATH = "cover_image.png"
+COVER_ASSET_PATH = "cover_image.rgbz"
+IMAGE_ASSET_MAGIC = b'RDIM'
+IMAGE_ASSET_VERSION = 1
+IMAGE_ASSET_HEADER = struct.Struct('<4sBHH')  # magic, version, width, height
+IMAGE_ASSET_CHUNK = 64 * 1024  # compressed bytes inflated per step
+
+
+def save_image_asset(path, surface):
+    width, height = surface.get_size()
+    with open(path, 'wb') as f:
+        f.write(IMAGE_ASSET_HEADER.pack(IMAGE_ASSET_MAGIC, IMAGE_ASSET_VERSION, width, height))
+        f.write(zlib.compress(pygame.image.tobytes(surface, 'RGB'), 9))
+
+
+def load_image_asset(path, size):
+    """
+    Generator that decodes an image asset a chunk per step, yielding None while it works
+    and then the surface. Raises ValueError if the file isn't a valid asset of `size`.
+    """
+    data = read_asset(path)
+    if len(data) < IMAGE_ASSET_HEADER.size:
+        raise ValueError(f"{path} is not an image asset")
+    magic, version, width, height = IMAGE_ASSET_HEADER.unpack_from(data)
+    if magic != IMAGE_ASSET_MAGIC or version != IMAGE_ASSET_VERSION or (width, height) != tuple(size):
+        raise ValueError(f"{path} is not a version {IMAGE_ASSET_VERSION} {size[0]}x{size[1]} image asset")
+
+    inflater = zlib.decompressobj()
+    pixels = []
+    for start in range(IMAGE_ASSET_HEADER.size, len(data), IMAGE_ASSET_CHUNK):
+        pixels.append(inflater.decompress(data[start:start + IMAGE_ASSET_CHUNK]))
+        yield None
+    pixels.append(inflater.flush())
+    pixels = b''.join(pixels)
+    if len(pixels) != width * height * 3:
+        raise ValueError(f"{path} is truncated")
+    yield pygame.image.frombuffer(pixels, (width, height), 'RGB').convert()
+
+
+def load_cover_image():
+    """
+    Generator that yields None while the cover loads, then the canvas-sized cover, or
+    False if there is none to show.
+    """
+    # Still on its way in the deferred asset bundle
+    while asset_pending(COVER_ASSET_PATH) and asset_bundle_busy():
+        yield None
+    try:
+        yield from load_image_asset(COVER_ASSET_PATH, (CANVAS_WIDTH, CANVAS_HEIGHT))
+        return
+    except (OSError, ValueError, zlib.error) as e:
+        print(f"Warning: No pre-scaled cover, scaling {COVER_IMAGE_PATH} instead. Run tools/build_assets.py. Error: {e}")
+
+    yield None  # the slow path blocks, so let a placeholder frame go out first
+    try:
+        # Load the image from the file
+        loaded_image = pygame.image.load(os.path.join(ASSET_SOURCE_DIR, COVER_IMAGE_PATH)).convert()
+        # Scale it to fit the screen perfectly
+        yield pygame.transform.scale(loaded_image, (CANVAS_WIDTH, CANVAS_HEIGHT))
+    except (pygame.error, OSError) as e:
+        print(f"Warning: Could not load {COVER_IMAGE_PATH}. Skipping cover screen. Error: {e}")
+        yield False
+
+
+# --- Asset Bundle ---
+# tools/build_assets.py packs the runtime assets into two bundles in ASSET_BUNDLE_DIR,
+# named after the hash of their contents so browsers can cache them for good, next to a
+# small manifest with every asset's hash, offset and size. Each asset is zlib-compressed on
+# its own (or stored, if that is smaller). The small boot bundle is read before the first
+# frame; the deferred one is fetched once that frame is out (without blocking, on the web)
+# and streams in a chunk per frame while the cover and intro play. Assets that aren't in a
+# bundle, or all of them without one, are read from their loose files in ASSET_SOURCE_DIR,
+# or where that isn't shipped (the web build) from the copies next to the bundles. The
+# TTFs aren't bundled and aren't in the web build's app archive either: BitmapFont only
+# needs one for a glyph the atlas lacks, so on the web it is only downloaded if that happens.
+ASSET_BUNDLE_DIR = "static"  # pygbag copies this folder to the web root
+# The loose runtime assets and their sources. pygbag leaves /ignore (and /static) out of the
+# app archive, so the web build only downloads what it fetches from ASSET_BUNDLE_DIR.
+ASSET_SOURCE_DIR = "ignore"
+# Directory or http(s) URL of the manifest; on the web it sits next to the page
+ASSET_BASE = os.environ.get("RADIANT_ASSET_BASE", "" if IS_WEB_BUILD else ASSET_BUNDLE_DIR)
+ASSET_MANIFEST = "assets.json"
+ASSET_BUNDLE_VERSION = 2
+ASSET_STREAM_CHUNK = 64 * 1024  # bundle bytes read per frame
+BOOT_ASSETS = (FONT_METRICS_PATH, FONT_ATLAS_PATH)
+DEFERRED_ASSETS = (COVER_ASSET_PATH,)
+BUNDLED_ASSETS = BOOT_ASSETS + DEFERRED_ASSETS
+ON_DEMAND_ASSETS = (FONT_PATH, FONT_PATH_2)
+ASSETS = {}  # asset name -> bytes, as the bundles deliver them
+# The bundle streaming in, the assets still to come, the deferred bundle's (url, assets)
+# until it has been fetched, and the task fetching it
+ASSET_BUNDLE = {'stream': None, 'pending': set(), 'deferred': None, 'fetch': None}
+
+
+def asset_url(name, base=None):
+    base = ASSET_BASE if base is None else base
+    return f"{base.rstrip('/')}/{name}" if base else name
+
+
+def open_asset_url(url):
+    """A binary file object reading url, which is an http(s) URL or a path. Raises OSError if it can't be fetched."""
+    import urllib.request
     if IS_WEB_BUILD:
-        await asyncio.sleep(0.5)
-    else:
-        pygame.time.wait(500)
+        # pygbag has no streaming HTTP; its urlretrieve fetches the whole file with a blocking
+        # XHR and raises a bare Exception for an HTTP error such as a 404
+        try:
+            url, _ = urllib.request.urlretrieve(url)
+        except Exception as e:
+            raise OSError(f"Could not fetch {url}: {e}") from e
+    elif url.startswith(('http://', 'https://')):
+        return urllib.request.urlopen(url, timeout=30)
+    return open(url, 'rb')
+
+
+async def fetch_asset_url(url):
+    """Like open_asset_url, but on the web build the browser downloads url while frames keep going out."""
+    if not IS_WEB_BUILD:
+        return open_asset_url(url)  # a stream, read a chunk per frame
+    import platform  # pygbag's, with an async fetch
+    try:
+        async with platform.fopen(url, 'rb') as f:
+            return io.BytesIO(f.read())
+    except Exception as e:
+        raise OSError(f"Could not fetch {url}: {e}") from e
 
-# screens
-async def show_cover_screen(screen, clock, cover_image, duration_seconds):
 
-    start_time = pygame.time.get_ticks()
-    duration_ms = duration_seconds * 5000
+def stream_asset_bundle(source, assets):
+    """
+    Generator that reads a bundle from source a chunk per step, yielding None after each
+    read and moving every asset into ASSETS as soon as all of its bytes are in. Raises
+    ValueError if the bundle is truncated or an asset doesn't match its hash.
+    """
+    read = getattr(source, 'read1', source.read)  # whatever has arrived, not a full chunk
+    buffer = bytearray()
+    position = 0
+    with source:
+        for name, entry in sorted(assets.items(), key=lambda item: item[1]['offset']):
+            if entry['offset'] != position:
+                raise ValueError(f"{ASSET_MANIFEST} has a gap before {name}")
+            while len(buffer) < entry['length']:
+                chunk = read(ASSET_STREAM_CHUNK)
+                if not chunk:
+                    raise ValueError(f"the asset bundle ends inside {name}")
+                buffer += chunk
+                yield None
+            data = bytes(buffer[:entry['length']])
+            del buffer[:entry['length']]
+            position += entry['length']
+            if entry['compressed']:
+                data = zlib.decompress(data)
+            if hashlib.sha256(data).hexdigest() != entry['sha256']:
+                raise ValueError(f"{name} in the asset bundle doesn't match its hash")
+            ASSETS[name] = data
+            ASSET_BUNDLE['pending'].discard(name)
+
+
+def start_asset_bundle(base=None):
+    """
+    Reads the manifest and the boot bundle, leaving the deferred bundle to
+    fetch_deferred_assets. Returns False, leaving every asset to its loose file, if there
+    is no usable bundle.
+    """
+    ASSETS.clear()
+    ASSET_BUNDLE.update(stream=None, pending=set(), deferred=None, fetch=None)
+    try:
+        with open_asset_url(asset_url(ASSET_MANIFEST, base)) as f:
+            manifest = json.loads(f.read())
+        if manifest.get('version') != ASSET_BUNDLE_VERSION:
+            raise ValueError(f"{ASSET_MANIFEST} is not a version {ASSET_BUNDLE_VERSION} manifest")
+        boot, deferred = manifest['boot'], manifest['deferred']
+        source = open_asset_url(asset_url(boot['bundle'], base))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: No asset bundle, reading the loose asset files. Run tools/build_assets.py. Error: {e}")
+        return False
 
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
-                    running = False
-        if pygame.time.get_ticks() - start_time >= duration_ms:
-            running = False # Exit the loop
-
-        # Drawing
-        screen.blit(cover_image, (0, 0))
-        # if CANVAS_WIDTH == 800:
-        #     screen.blit(cover_image_800, (0, 0))
-        # else:
-        #     screen.blit(cover_image_1200, (0, 0))
+    ASSET_BUNDLE.update(stream=stream_asset_bundle(source, boot['assets']),
+                        pending=set(boot['assets']) | set(deferred['assets']),
+                        deferred=(asset_url(deferred['bundle'], base), deferred['assets']))
+    while ASSET_BUNDLE['stream'] is not None:
+        pump_asset_bundle()
+    return True
 
-        pygame.display.flip()
-        if IS_WEB_BUILD:
-            await asyncio.sleep(0)
-        else:
-            clock.tick(60)
 
+def fetch_deferred_assets():
+    """Starts fetching the deferred bundle, which pump_asset_bundle streams in once it's here. Run after the first frame."""
+    if ASSET_BUNDLE['deferred'] is not None and ASSET_BUNDLE['fetch'] is None:
+        ASSET_BUNDLE['fetch'] = asyncio.ensure_future(fetch_asset_url(ASSET_BUNDLE['deferred'][0]))
 
-async def show_level_complete_screen(screen, clock, fonts, level_index, lives, score, total_points):
-    key = f'level_{level_index}_complete'
-    text_content = SCREEN_TEXT.get(key, {
-        'title': f"Level {level_index} Complete",
-        'story': [],
-        'prompt': "Press [SPACE] or [ENTER] to continue"
-    })
 
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
-                    running = False # Exit the loop to return from the function
+def asset_bundle_busy():
+    """True while a bundle is streaming in or the deferred one hasn't arrived yet."""
+    return ASSET_BUNDLE['stream'] is not None or ASSET_BUNDLE['deferred'] is not None
+
 
+def pump_asset_bundle():
+    """
+    Reads the next chunk of the bundle streaming in, or starts streaming the deferred one
+    once it has been fetched. Called once per frame.
+    """
+    stream = ASSET_BUNDLE['stream']
+    if stream is None:
+        fetch = ASSET_BUNDLE['fetch']
+        if fetch is None or not fetch.done():
+            return
+        _, assets = ASSET_BUNDLE['deferred']
+        ASSET_BUNDLE.update(deferred=None, fetch=None)
+        try:
+            ASSET_BUNDLE['stream'] = stream_asset_bundle(fetch.result(), assets)
+        except OSError as e:
+            print(f"Warning: Could not fetch the deferred asset bundle, reading its assets from the loose files. "
+                  f"Error: {e}")
+            ASSET_BUNDLE['pending'].clear()
+        return
+    try:
+        next(stream)
+    except StopIteration:
+        ASSET_BUNDLE['stream'] = None
+    except (OSError, ValueError, zlib.error) as e:
+        print(f"Warning: The asset bundle stopped streaming, reading the rest from the loose files. Error: {e}")
+        # The deferred bundle's assets may still come
+        deferred = ASSET_BUNDLE['deferred']
+        ASSET_BUNDLE['stream'] = None
+        ASSET_BUNDLE['pending'].intersection_update(deferred[1] if deferred else ())
+
+
+def asset_pending(name):
+    """True while a bundle is still on its way to delivering name."""
+    return name in ASSET_BUNDLE['pending']
+
+
+def read_asset(name):
+    """
+    The bytes of an asset, waiting for the bundle if it is still streaming it in; one
+    still being fetched is read from its loose file in ASSET_SOURCE_DIR instead. That
+    folder isn't in the web build's app archive, so there the loose file is fetched from
+    ASSET_BASE.
+    """
+    while asset_pending(name) and ASSET_BUNDLE['stream'] is not None:
+        pump_asset_bundle()
+    data = ASSETS.get(name)
+    if data is None:
+        try:
+            f = open(os.path.join(ASSET_SOURCE_DIR, name), 'rb')
+        except FileNotFoundError:
+            f = open_asset_url(asset_url(name))
+        with f:
+            data = f.read()
+    return data
+
+
+# screens
+class CoverScene(Scene):
+    def __init__(self, fonts, cover_loader, duration_seconds):
+        super().__init__()
+        self.fonts = fonts
+        self.cover_loader = cover_loader
+        self.cover_image = None
+        duration_ms = duration_seconds * 5000
+        self.duration_ticks = duration_ms * self.tick_rate // 1000
+        self.ticks = 0
+        self.presented = None
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
+                self.done = True
+
+    def invalidate(self):
+        self.presented = None
+
+    def update(self):
+        if self.cover_image is None:
+            self.cover_image = next(self.cover_loader)
+            # Skip the cover screen if the image could not be loaded
+            self.done = self.cover_image is False
+            return
+
+        # The cover's time on screen starts once it is shown
+        self.ticks += 1
+        if self.ticks >= self.duration_ticks:
+            self.done = True # Exit the loop
+
+    def draw(self, screen):
+        frame = 'placeholder' if self.cover_image is None else 'cover'
+        # A static screen only needs presenting once in dirty-rect mode
+        if DIRTY_RECT_RENDERING and self.presented == frame:
+            return []
+        if self.cover_image is None:
+            screen.fill(COLOR_1)
+            draw_text(screen, "RADIANT", self.fonts['screen_title'], COLOR_2, (CANVAS_WIDTH / 2, CANVAS_HEIGHT / 2))
+        else:
+            screen.blit(self.cover_image, (0, 0))
+        # if CANVAS_WIDTH == 800:
+        #     screen.blit(cover_image_800, (0, 0))
+        # else:
+        #     screen.blit(cover_image_1200, (0, 0))
+        self.presented = frame
+        return None
+
+
+class LevelCompleteScene(Scene):
+    def __init__(self, fonts, level_index, lives, score, total_points):
+        super().__init__()
+        self.fonts = fonts
+        self.lives, self.score, self.total_points = lives, score, total_points
+        key = f'level_{level_index}_complete'
+        self.text_content = SCREEN_TEXT.get(key, {
+            'title': f"Level {level_index} Complete",
+            'story': [],
+            'prompt': "Press [SPACE] or [ENTER] to continue"
+        })
+        self.frame_presented = False
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
+                self.done = True # Exit to continue with the next level
+
+    def invalidate(self):
+        self.frame_presented = False
+
+    def draw(self, screen):
+        # Nothing on this screen changes, so dirty-rect mode presents it once
+        if DIRTY_RECT_RENDERING and self.frame_presented:
+            return []
+        fonts, text_content = self.fonts, self.text_content
         screen.fill(COLOR_1)
         draw_text(screen, text_content['title'], fonts['title'], COLOR_4, (CANVAS_WIDTH / 2, 96))
         story_y_start = 350
         for i, line in enumerate(text_content['story']):
             draw_text(screen, line, fonts['story'], COLOR_2, (CANVAS_WIDTH / 2, story_y_start + i * 40))
         draw_text(screen, text_content['prompt'], fonts['prompt'], COLOR_3, (CANVAS_WIDTH / 2, CANVAS_HEIGHT - SIZE * 5))
-        draw_lives(screen, lives)
-        draw_score(screen, fonts['score'], score, total_points)
-
-        pygame.display.flip()
+        draw_lives(screen, self.lives)
+        draw_score(screen, fonts['score'], self.score, self.total_points)
+        self.frame_presented = True
+        return None
+
+
+class OutroScene(Scene):
+    """The single, unified end screen with name entry. `result` is True to restart, False to quit."""
+
+    def __init__(self, fonts, game_state, score, total_points):
+        super().__init__()
+        self.fonts = fonts
+        self.text_content = SCREEN_TEXT[game_state]
+        final_display_score = int((score / total_points) * MAX_DISPLAY_SCORE) if total_points > 0 else 0
+        self.final_display_score = min(final_display_score, MAX_DISPLAY_SCORE)
+        self.score_text = f"Final Score: {self.final_display_score:04d}"
+
+        # --- Variables for name entry ---
+        self.player_name = ""
+        self.cursor_visible = True
+        self.ticks_since_cursor_toggle = 0
+        # Dirty-rect mode: what the presented frame shows, and the strip the name field lives in
+        self.presented_name_field = None
+        name_line_height = fonts['level_start'].get_linesize()
+        self.name_field_rect = pygame.Rect(0, CANVAS_HEIGHT * 0.55 - name_line_height / 2,
+                                           CANVAS_WIDTH, name_line_height)
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN or self.done:
+            return
+        # Pressing ESC always quits
+        if event.key == pygame.K_ESCAPE:
+            self.done, self.result = True, False  # Quit
+
+        # Pressing RETURN confirms the name and restarts
+        elif event.key == pygame.K_RETURN:
+            # Use a default name if the player enters nothing
+            final_name = self.player_name if self.player_name else "USER"
+            print(f"Player: {final_name}, Score: {self.final_display_score}")
+            self.done, self.result = True, True  # Restart
+
+        # Handle name typing
+        elif event.key == pygame.K_BACKSPACE:
+            self.player_name = self.player_name[:-1]
+        elif len(self.player_name) < 4 and event.unicode.isalnum():
+            self.player_name += event.unicode.upper()
+
+    def invalidate(self):
+        self.presented_name_field = None
+
+    def update(self):
+        # 6. Blinking cursor logic
+        self.ticks_since_cursor_toggle += 1
+        if self.ticks_since_cursor_toggle * 1000 > 750 * self.tick_rate:  # Toggle every 750ms
+            self.cursor_visible = not self.cursor_visible
+            self.ticks_since_cursor_toggle = 0
+
+    def draw(self, screen):
+        fonts, text_content = self.fonts, self.text_content
+        player_name, cursor_visible = self.player_name, self.cursor_visible
+
+        # In dirty-rect mode only the name field and cursor ever change after the first frame
+        name_field = (player_name, cursor_visible)
+        if DIRTY_RECT_RENDERING and name_field == self.presented_name_field:
+            return []
+        repaint_name_field_only = DIRTY_RECT_RENDERING and self.presented_name_field is not None
+        self.presented_name_field = name_field
 
-        #universal frame rate control
-        if IS_WEB_BUILD:
-            await asyncio.sleep(0)
+        # --- Unified Drawing Logic ---
+        if repaint_name_field_only:
+            screen.fill(COLOR_1, self.name_field_rect)
         else:
-            clock.tick(60)
-
-
-async def show_outro_screen(screen, clock, fonts, game_state, score, total_points):
-    text_content = SCREEN_TEXT[game_state]
-    final_display_score = int((score / total_points) * MAX_DISPLAY_SCORE) if total_points > 0 else 0
-    final_display_score = min(final_display_score, MAX_DISPLAY_SCORE)
-    score_text = f"Final Score: {final_display_score:04d}"
-
-    # --- Variables for name entry ---
-    player_name = ""
-    cursor_visible = True
-    last_cursor_toggle = pygame.time.get_ticks()
+            screen.fill(COLOR_1)
 
-    # The main loop for the single, unified screen
-    while True:
-        # --- Event Handling ---
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                # Pressing ESC always quits
-                if event.key == pygame.K_ESCAPE:
-                    return False  # Quit
-
-                # Pressing RETURN confirms the name and restarts
-                if event.key == pygame.K_RETURN:
-                    # Use a default name if the player enters nothing
-                    final_name = player_name if player_name else "USER"
-                    print(f"Player: {final_name}, Score: {final_display_score}")
-                    return True  # Restart
-
-                # Handle name typing
-                if event.key == pygame.K_BACKSPACE:
-                    player_name = player_name[:-1]
-                elif len(player_name) < 4 and event.unicode.isalnum():
-                    player_name += event.unicode.upper()
-
-        # --- Unified Drawing Logic ---
-        screen.fill(COLOR_1)
+            # 1. Draw Title at the top
+            title_color = COLOR_4 # if game_state == "win" else "red"
+            draw_text(screen, text_content['title'], fonts['title'], title_color, (CANVAS_WIDTH / 2, CANVAS_HEIGHT * 0.15))
 
-        # 1. Draw Title at the top
-        title_color = COLOR_4 # if game_state == "win" else "red"
-        draw_text(screen, text_content['title'], fonts['title'], title_color, (CANVAS_WIDTH / 2, CANVAS_HEIGHT * 0.15))
+            # 2. Draw Final Score
+            draw_text(screen, self.score_text, fonts['level_start'], COLOR_3, (CANVAS_WIDTH / 2, CANVAS_HEIGHT * 0.45 ))
 
-        # 2. Draw Final Score
-        draw_text(screen, score_text, fonts['level_start'], COLOR_3, (CANVAS_WIDTH / 2, CANVAS_HEIGHT * 0.45 ))
+            # 3. *** Draw the Story Text ***
+            # draw_text(screen, text_content['story'], fonts['story'], COLOR_2, (CANVAS_WIDTH / 2, CANVAS_HEIGHT * 0.45))
 
-        # 3. *** Draw the Story Text ***
-        # draw_text(screen, text_content['story'], fonts['story'], COLOR_2, (CANVAS_WIDTH / 2, CANVAS_HEIGHT * 0.45))
+            # 4. Draw Name Entry Prompt
+            draw_text(screen, "Enter Your Name:", fonts['story'], COLOR_2, (CANVAS_WIDTH / 2, CANVAS_HEIGHT * 0.5 ))
 
-        # 4. Draw Name Entry Prompt
-        draw_text(screen, "Enter Your Name:", fonts['story'], COLOR_2, (CANVAS_WIDTH / 2, CANVAS_HEIGHT * 0.5 ))
+            # 5. Draw the final instructions at the bottom
+            draw_text(screen, text_content['prompt'], fonts['prompt'], COLOR_3, (CANVAS_WIDTH / 2, CANVAS_HEIGHT *0.90))
 
         # 4.1. Create and Draw the "_ _ _ _" input field
         display_chars = list(player_name)
@@ -430,15 +1365,6 @@ async def show_outro_screen(screen, clock, fonts, game_state, score, total_point
         name_display_text = " ".join(display_chars)
         draw_text(screen, name_display_text, fonts['level_start'], COLOR_2, (CANVAS_WIDTH / 2, CANVAS_HEIGHT * 0.55))
 
-        # 5. Draw the final instructions at the bottom
-        draw_text(screen, text_content['prompt'], fonts['prompt'], COLOR_3, (CANVAS_WIDTH / 2, CANVAS_HEIGHT *0.90))
-
-        # 6. Blinking cursor logic
-        now = pygame.time.get_ticks()
-        if now - last_cursor_toggle > 750:  # Toggle every 500ms
-            cursor_visible = not cursor_visible
-            last_cursor_toggle = now
-
         if cursor_visible:
             # Calculate where the cursor should be
             base_text_width, _ = fonts['level_start'].size(name_display_text)
@@ -456,11 +1382,7 @@ async def show_outro_screen(screen, clock, fonts, game_state, score, total_point
             cursor_rect = pygame.Rect(cursor_x - 2, cursor_y - 12, 4, 24)
             pygame.draw.rect(screen, COLOR_4, cursor_rect)
 
-        pygame.display.flip()
-        if IS_WEB_BUILD:
-            await asyncio.sleep(0)
-        else:
-            clock.tick(60)
+        return [self.name_field_rect] if repaint_name_field_only else None
 
 
 
@@ -581,47 +1503,199 @@ LEVEL_CONFIGS = [
 
 
 # --- Drawing Functions ---
+SHIP_SHAPE = [(0, 2), (0, 3), (2, 0), (2, 1), (2, 2), (2, 3), (4, 2), (4, 3)]
+
+# --- Sprite Cache ---
+# Entities are rendered once per part layout (offsets + alive/destroyed state) and
+# blitted as a single surface afterwards; a hit simply produces a new cache key.
+# The cache is LRU: a hit moves the key to the end, the oldest-used entry is evicted.
+SPRITE_CACHE = OrderedDict()
+SPRITE_CACHE_LIMIT = 256
+
+
+def _render_parts_sprite(layout, part_size, spacing, show_destroyed):
+    """
+    Renders a part layout, a tuple of ((offset_x, offset_y), is_alive) pairs, onto a
+    transparent surface. Returns the surface, its top-left offset in pixels and the rects
+    of the parts drawn on it.
+    """
+    origin_x = int(min(offset[0] for offset, _ in layout) * spacing)
+    origin_y = int(min(offset[1] for offset, _ in layout) * spacing)
+    width = int(max(offset[0] for offset, _ in layout) * spacing) - origin_x + int(part_size)
+    height = int(max(offset[1] for offset, _ in layout) * spacing) - origin_y + int(part_size)
+
+    sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+    parts = []
+    for (offset_x, offset_y), is_alive in layout:
+        rect = pygame.Rect(int(offset_x * spacing) - origin_x, int(offset_y * spacing) - origin_y, part_size, part_size)
+        if is_alive:
+            pygame.draw.rect(sprite, COLOR_2, rect)
+        elif show_destroyed:
+            pygame.draw.rect(sprite, (255, 255, 255, ALPHA), rect)
+        else:
+            continue
+        parts.append(rect)
+    return sprite, (origin_x, origin_y), tuple(parts)
+
+
+def get_cached_sprite(layout, part_size=SIZE, spacing=INTERNAL_SPACE, show_destroyed=True):
+    key = (layout, part_size, spacing, show_destroyed)
+    cached = SPRITE_CACHE.get(key)
+    if cached is None:
+        if len(SPRITE_CACHE) >= SPRITE_CACHE_LIMIT:
+            SPRITE_CACHE.popitem(last=False)
+        cached = _render_parts_sprite(layout, part_size, spacing, show_destroyed)
+        SPRITE_CACHE[key] = cached
+    else:
+        SPRITE_CACHE.move_to_end(key)
+    return cached
+
+
+def get_entity_sprite(parts, offset_key='offset', show_destroyed=True, scale=1):
+    layout = tuple((tuple(p[offset_key]), p['status'] == 'alive') for p in parts)
+    return get_cached_sprite(layout, SIZE * scale, INTERNAL_SPACE * scale, show_destroyed)
+
+
+# Translucent layers (the level-4 blueprint, ghost parts) are composited once per
+# pattern and colour; alpha blits are the slowest path of SDL's software blitter.
+LAYER_CACHE = {}
+# HUD labels shrunk for playfields drawn below canvas resolution (see RENDER_DIVISOR)
+SCALED_LABEL_CACHE = {}
+
+
+def get_translucent_layer(offsets, color, part_size=SIZE, spacing=INTERNAL_SPACE):
+    """A square of `color` (RGBA) at each offset, on one transparent surface. Blit it with blit_sprite."""
+    key = (tuple(offsets), color, part_size, spacing)
+    cached = LAYER_CACHE.get(key)
+    if cached is None:
+        if len(LAYER_CACHE) >= SPRITE_CACHE_LIMIT:
+            del LAYER_CACHE[next(iter(LAYER_CACHE))]
+        origin_x = int(min(offset[0] for offset in offsets) * spacing)
+        origin_y = int(min(offset[1] for offset in offsets) * spacing)
+        width = int(max(offset[0] for offset in offsets) * spacing) - origin_x + int(part_size)
+        height = int(max(offset[1] for offset in offsets) * spacing) - origin_y + int(part_size)
+
+        layer = pygame.Surface((width, height), pygame.SRCALPHA)
+        parts = tuple(pygame.Rect(int(offset_x * spacing) - origin_x, int(offset_y * spacing) - origin_y,
+                                  part_size, part_size) for offset_x, offset_y in offsets)
+        for rect in parts:
+            layer.fill(color, rect)
+        cached = LAYER_CACHE[key] = (layer, (origin_x, origin_y), parts)
+    return cached
+
+
+def sprite_blits(cached_sprite, x, y):
+    """
+    (source, dest, area) blits that put a cached sprite at (x, y) in framebuffer pixels with
+    every part where a Rect of its own would be: at its offset plus the position, truncated.
+    """
+    sprite, (origin_x, origin_y), parts = cached_sprite
+    width, height = sprite.get_size()
+    left, top = int(x + origin_x), int(y + origin_y)
+    # Normally every sum truncates alike and the sprite is one blit. Past the left or top
+    # edge, or with the position a rounding error below a whole pixel, the sums further
+    # out can land a pixel apart; the parts are placed one by one then.
+    if (x + origin_x >= 0 and y + origin_y >= 0 and int(x + (origin_x + width)) - width == left
+            and int(y + (origin_y + height)) - height == top):
+        return [(sprite, (left, top), None)]
+    return [(sprite, (int(x + (origin_x + rect.x)), int(y + (origin_y + rect.y))), rect) for rect in parts]
+
+
+def blit_sprite(screen, cached_sprite, x, y, scale=1):
+    """Blits a sprite rendered at `scale` for an entity at canvas position (x, y)."""
+    screen.blits(sprite_blits(cached_sprite, x * scale, y * scale), doreturn=False)
+
+
+def scale_rect(rect, scale):
+    """A canvas rect in the pixels of a framebuffer at `scale`, rounded outwards so it covers what was drawn."""
+    if scale == 1:
+        return pygame.Rect(rect)
+    left, top = math.floor(rect[0] * scale), math.floor(rect[1] * scale)
+    return pygame.Rect(left, top, math.ceil((rect[0] + rect[2]) * scale) - left,
+                       math.ceil((rect[1] + rect[3]) * scale) - top)
+
+
 def draw_square(screen, x, y, color):
     rect = pygame.Rect(x, y, SIZE, SIZE)
     pygame.draw.rect(screen, color, rect)
 
 
-def draw_ship(screen, x, y):
-    color = COLOR_2
-    ship_shape = [(0, 2), (0, 3), (2, 0), (2, 1), (2, 2), (2, 3), (4, 2), (4, 3)]
-    for part in ship_shape:
-        draw_square(screen, x + part[0] * SIZE, y + part[1] * SIZE, color)
+def draw_ship(screen, x, y, scale=1):
+    layout = tuple((part, True) for part in SHIP_SHAPE)
+    blit_sprite(screen, get_cached_sprite(layout, SIZE * scale, SIZE * scale), x, y, scale)
 
 
-def _draw_life_ship(screen, x, y):
-    color = COLOR_2
-    scaled_size = SIZE / 2
-    ship_shape = [(0, 2), (0, 3), (2, 0), (2, 1), (2, 2), (2, 3), (4, 2), (4, 3)]
-    for part in ship_shape:
-        rect = pygame.Rect(x + part[0] * scaled_size, y + part[1] * scaled_size, scaled_size, scaled_size)
-        pygame.draw.rect(screen, color, rect)
+def _draw_life_ship(screen, x, y, scale=1):
+    scaled_size = SIZE / 2 * scale
+    layout = tuple((part, True) for part in SHIP_SHAPE)
+    blit_sprite(screen, get_cached_sprite(layout, part_size=scaled_size, spacing=scaled_size), x, y, scale)
 
 
-def draw_lives(screen, lives):
+def draw_lives(screen, lives, scale=1):
     if lives <= 0: return
     life_ship_height = 4 * (SIZE / 2)
     life_ship_width = 5 * (SIZE / 2)
     base_x = SIZE
     base_y = CANVAS_HEIGHT - SIZE - life_ship_height
     for i in range(lives):
-        _draw_life_ship(screen, base_x + i * (life_ship_width + SIZE), base_y)
+        _draw_life_ship(screen, base_x + i * (life_ship_width + SIZE), base_y, scale)
 
 
-def draw_score(screen, score_font, raw_score, total_game_points):
+def lives_rect(lives):
+    """The canvas rect draw_lives fills for `lives` ships."""
+    life_ship_height = 4 * (SIZE / 2)
+    life_ship_width = 5 * (SIZE / 2)
+    return pygame.Rect(SIZE, CANVAS_HEIGHT - SIZE - life_ship_height, lives * (life_ship_width + SIZE),
+                       life_ship_height)
+
+
+def render_lives(lives, scale=1):
+    """
+    The lives row on one transparent surface with the rect draw_lives fills, in the
+    pixels of a framebuffer at `scale`, or None with no lives left.
+    """
+    if lives <= 0: return None
+    rect = scale_rect(lives_rect(lives), scale)
+    layer = pygame.Surface(rect.size, pygame.SRCALPHA)
+    scaled_size = SIZE / 2 * scale
+    layout = tuple((part, True) for part in SHIP_SHAPE)
+    sprite, (origin_x, origin_y), _ = get_cached_sprite(layout, part_size=scaled_size, spacing=scaled_size)
+    # Same positions as draw_lives, relative to the row's top-left corner
+    y = int((CANVAS_HEIGHT - SIZE - 4 * (SIZE / 2)) * scale) + origin_y - rect.y
+    for i in range(lives):
+        x = int((SIZE + i * (5 * (SIZE / 2) + SIZE)) * scale) + origin_x - rect.x
+        layer.blit(sprite, (x, y))
+    return layer, rect
+
+
+def display_score_text(raw_score, total_game_points):
+    """The four digits the HUD shows for a raw score."""
     display_score = int((raw_score / total_game_points) * MAX_DISPLAY_SCORE) if total_game_points > 0 else 0
-    display_score = min(display_score, MAX_DISPLAY_SCORE)
-    score_text = f"{display_score:04d}"
-    score_label = score_font.render(score_text, 1, COLOR_2)
-    score_rect = score_label.get_rect(bottomright=(CANVAS_WIDTH - SIZE, CANVAS_HEIGHT - SIZE))
+    return f"{min(display_score, MAX_DISPLAY_SCORE):04d}"
+
+
+def _score_label(score_font, raw_score, total_game_points, scale=1):
+    score_text = display_score_text(raw_score, total_game_points)
+    # The label is only rasterised again when the displayed value changes
+    score_label = render_text(score_font, score_text, COLOR_2)
+    if scale != 1:
+        key = (id(score_font), score_text, scale)
+        scaled = SCALED_LABEL_CACHE.get(key)
+        if scaled is None:
+            if len(SCALED_LABEL_CACHE) >= SPRITE_CACHE_LIMIT:
+                del SCALED_LABEL_CACHE[next(iter(SCALED_LABEL_CACHE))]
+            scaled = SCALED_LABEL_CACHE[key] = pygame.transform.smoothscale_by(score_label, scale)
+        score_label = scaled
+    return score_label, score_label.get_rect(bottomright=(int((CANVAS_WIDTH - SIZE) * scale),
+                                                          int((CANVAS_HEIGHT - SIZE) * scale)))
+
+
+def draw_score(screen, score_font, raw_score, total_game_points, scale=1):
+    score_label, score_rect = _score_label(score_font, raw_score, total_game_points, scale)
     screen.blit(score_label, score_rect)
 
 
-def draw_entity_part(screen, base_x, base_y, part_data, is_level_4_boss=False):
+def draw_entity_part(screen, base_x, base_y, part_data, is_level_4_boss=False, scale=1):
     if is_level_4_boss:
         offset_to_use = part_data['visual_offset']
     else:
@@ -631,62 +1705,103 @@ def draw_entity_part(screen, base_x, base_y, part_data, is_level_4_boss=False):
     part_y = base_y + offset_to_use[1] * INTERNAL_SPACE
 
     if part_data['status'] == 'alive':
-        rect = pygame.Rect(part_x, part_y, SIZE, SIZE)
+        rect = pygame.Rect(part_x * scale, part_y * scale, SIZE * scale, SIZE * scale)
         pygame.draw.rect(screen, COLOR_2, rect)
     elif part_data['status'] == 'destroyed' and not is_level_4_boss:
-        s = pygame.Surface((SIZE, SIZE), pygame.SRCALPHA)
-        s.fill((255, 255, 255, ALPHA))
-        screen.blit(s, (part_x, part_y))
+        ghost = get_translucent_layer(((0, 0),), (255, 255, 255, ALPHA), SIZE * scale, INTERNAL_SPACE * scale)[0]
+        screen.blit(ghost, (part_x * scale, part_y * scale))
 
 
-def draw_drone(screen, drone_data):
-    drone_base_x = drone_data['x']
-    drone_base_y = drone_data['y']
-    for part_data in drone_data['parts']:
-        draw_entity_part(screen, drone_base_x, drone_base_y, part_data)
+def draw_drone(screen, drone_data, scale=1):
+    if not drone_data['parts']: return
+    blit_sprite(screen, get_entity_sprite(drone_data['parts'], scale=scale), drone_data['x'], drone_data['y'], scale)
 
 
-def draw_battleship(screen, battleship_data, is_level_4_boss=False):
-    if battleship_data['status'] == 'destroyed': return
+def draw_battleship(screen, battleship_data, is_level_4_boss=False, boss_arrays=None, scale=1):
+    if battleship_data['status'] == 'destroyed' or not battleship_data['parts']: return
+    if boss_arrays is not None:
+        draw_boss_arrays(screen, battleship_data, boss_arrays, scale)
+        return
     base_x = battleship_data['x']
     base_y = battleship_data['y']
-    for part_data in battleship_data['parts']:
-        draw_entity_part(screen, base_x, base_y, part_data, is_level_4_boss)
 
+    # Off the left edge (wrapping around) parts are placed one by one, so each one is
+    # truncated towards zero like a Rect; a single sprite would shift them by a pixel.
+    if base_x < 0:
+        for part_data in battleship_data['parts']:
+            draw_entity_part(screen, base_x, base_y, part_data, is_level_4_boss, scale)
+        return
+
+    if is_level_4_boss:
+        # While the boss collapses, every tick is a new layout; draw it part by part
+        # instead of filling the sprite cache with frames that will never repeat.
+        if any(p['visual_offset'] != p['target_offset'] for p in battleship_data['parts']):
+            for part_data in battleship_data['parts']:
+                draw_entity_part(screen, base_x, base_y, part_data, is_level_4_boss, scale)
+            return
+        sprite = get_entity_sprite(battleship_data['parts'], 'visual_offset', show_destroyed=False, scale=scale)
+    else:
+        sprite = get_entity_sprite(battleship_data['parts'], scale=scale)
+    blit_sprite(screen, sprite, base_x, base_y, scale)
+
+
+def draw_fleet(screen, fleet, fleet_arrays=None, scale=1):
+    if fleet_arrays is not None:
+        # Positions live in the arrays while playing; the dicts only carry the parts
+        alive_indices = np.flatnonzero(fleet_arrays['alive']).tolist()
+        xs, ys = fleet_arrays['x'].tolist(), fleet_arrays['y'].tolist()
+        for i in alive_indices:
+            parts = fleet[i]['parts']
+            if parts:
+                blit_sprite(screen, get_entity_sprite(parts, scale=scale), xs[i], ys[i], scale)
+        return
 
-def draw_fleet(screen, fleet):
     for drone_data in fleet:
         if drone_data['status'] == 'alive':
-            draw_drone(screen, drone_data)
+            draw_drone(screen, drone_data, scale)
 
 
 
 # --- State Creation Functions ---
-def create_fleet(level_config):
-    fleet_ships = []
+def _is_core_protected(offsets, wings):
+    core_offset = next((offset for offset, wing in zip(offsets, wings) if wing == 'core'), None)
+    if not core_offset:
+        return False
+    core_x, core_y = core_offset
+    # Check if any 'body' part is directly in front of (same x, greater y) the core
+    return any(wing == 'body' and offset[0] == core_x and offset[1] > core_y for offset, wing in zip(offsets, wings))
+
+
+def _compile_drone_shape(shape):
+    offsets = tuple(d['offset'] for d in shape)
+    wings = tuple(d['wing'] for d in shape)
+    wing_parts = {}
+    for wing in wings:
+        wing_parts[wing] = wing_parts.get(wing, 0) + 1
+    return {
+        'offsets': offsets,
+        'wings': wings,
+        'wing_parts': wing_parts,
+        'is_core_protected': _is_core_protected(offsets, wings),
+        'max_points': len(offsets) * DRONE_PART_POINTS + DRONE_DESTROY_BONUS,
+    }
+
+
+def compile_fleet(level_config):
+    """Precomputes a level's fleet: its distinct drone shapes and a (row, col, shape_index) per drone."""
+    compiled = {'shapes': [], 'drones': []}
     num_rows = level_config.get('num_rows', 0)
     fleet_layout = level_config.get('fleet_layout')
+    if num_rows == 0 and not fleet_layout:
+        return compiled
 
-    # This is a helper function we'll define inside create_fleet
-    def is_core_protected(parts):
-        core_part = next((p for p in parts if p.get('wing') == 'core'), None)
-        if not core_part:
-            return False
-        core_x, core_y = core_part['offset']
-        # Check if any 'body' part is directly in front of (same x, greater y) the core
-        return any(p['wing'] == 'body' and p['offset'][0] == core_x and p['offset'][1] > core_y for p in parts)
+    shape_indexes = {}
 
-    if num_rows == 0 and not fleet_layout:
-        return fleet_ships
-
-    create_drone = lambda row, col, parts: {
-        'row': row, 'col': col, 'status': 'alive', 'parts': parts,
-        'x': 0, 'y': 0,
-        'hit_count': 0,
-        'hits_on_left_wing': 0,
-        'hits_on_right_wing': 0,
-        'is_core_protected': is_core_protected(parts)
-    }
+    def add_drone(row, col, shape_key, shape):
+        if shape_key not in shape_indexes:
+            shape_indexes[shape_key] = len(compiled['shapes'])
+            compiled['shapes'].append(_compile_drone_shape(shape))
+        compiled['drones'].append((row, col, shape_indexes[shape_key]))
 
     if fleet_layout:
         for row_num, drone_types_in_row in fleet_layout.items():
@@ -694,80 +1809,414 @@ def create_fleet(level_config):
                 if drone_type_key not in DRONE_SHAPES:
                     print(f"Warning: Drone type '{drone_type_key}' not found in DRONE_SHAPES. Skipping.")
                     continue
-
-                new_drone_parts = [{'offset': d['offset'], 'wing': d['wing'], 'status': 'alive'} for d in DRONE_SHAPES[drone_type_key]]
-                fleet_ships.append(create_drone(row_num - 1, col_num, new_drone_parts))
-        return fleet_ships
+                add_drone(row_num - 1, col_num, drone_type_key, DRONE_SHAPES[drone_type_key])
+        return compiled
 
     drone_shape_offsets = level_config.get('drone_shape_offsets')
     if drone_shape_offsets:
         for row in range(num_rows):
             for col in range(NUM_COLS):
-                new_drone_parts = [{'offset': d['offset'], 'wing': d['wing'], 'status': 'alive'} for d in drone_shape_offsets]
-                fleet_ships.append(create_drone(row, col, new_drone_parts))
+                add_drone(row, col, None, drone_shape_offsets)
+
+    return compiled
 
+
+def build_fleet(compiled_fleet):
+    """Fresh drone dicts for a compiled fleet."""
+    fleet_ships = []
+    shapes = compiled_fleet['shapes']
+    for row, col, shape_index in compiled_fleet['drones']:
+        shape = shapes[shape_index]
+        fleet_ships.append({
+            'row': row, 'col': col, 'status': 'alive',
+            'parts': [{'offset': offset, 'wing': wing, 'status': 'alive'}
+                      for offset, wing in zip(shape['offsets'], shape['wings'])],
+            'x': 0, 'y': 0,
+            'hit_count': 0,
+            'hits_on_left_wing': 0,
+            'hits_on_right_wing': 0,
+            'is_core_protected': shape['is_core_protected'],
+            'wing_parts': shape['wing_parts'],
+            'alive_wing_parts': dict(shape['wing_parts']),
+        })
     return fleet_ships
 
 
-def create_battleship(level_config):
-    parts = []
+def create_fleet(level_config):
+    return build_fleet(compile_fleet(level_config))
+
+
+def compile_battleship(level_config):
+    """Precomputes a level's battleship: part offsets, core flags and bounds. None if it has no parts."""
     default_shape = [(0, 1), (0, 2), (0, 3), (1, 3), (2, 1), (2, 2), (2, 3), (3, 3), (4, 1), (4, 2), (4, 3)]
     shape_offsets = level_config.get('battleship_shape_offsets', default_shape)
     core_offset = level_config.get('battleship_core_offset', (2, 1))
-    is_level_4_boss = level_config.get('level_number') == 4
 
     # This check is to prevent crashing on levels without a defined battleship
     if not shape_offsets:
+        return None
+
+    offsets = tuple(tuple(offset) for offset in shape_offsets)
+    core_flags = [offset == core_offset for offset in shape_offsets]
+    if not any(core_flags):
+        print(f"Warning: No core for battleship in level {level_config['level_number']}. Assigning first part as core.")
+        core_flags[0] = True
+
+    max_x = max(offset[0] for offset in offsets)
+    max_y = max(offset[1] for offset in offsets)
+    return {
+        'offsets': offsets,
+        'core_flags': tuple(core_flags),
+        'is_level_4_boss': level_config.get('level_number') == 4,
+        'width': (max_x * INTERNAL_SPACE) + SIZE,
+        'height': (max_y * INTERNAL_SPACE) + SIZE,
+        'max_points': len(offsets) * BATTLESHIP_PART_POINTS + BATTLESHIP_DESTROY_BONUS,
+    }
+
+
+def build_battleship(compiled_battleship):
+    """A fresh battleship dict for a compiled battleship."""
+    if compiled_battleship is None:
         return {'status': 'destroyed', 'parts': [], 'width': 0, 'height': 0}
 
-    for offset in shape_offsets:
-        is_core = (offset == core_offset)
+    parts = []
+    for offset, is_core in zip(compiled_battleship['offsets'], compiled_battleship['core_flags']):
         part_data = {'offset': offset, 'is_core': is_core, 'status': 'alive'}
-        if is_level_4_boss:
-            part_data['visual_offset'] = list(offset)
-            part_data['target_offset'] = list(offset)
+        if compiled_battleship['is_level_4_boss']:
+            part_data['visual_offset'] = [float(offset[0]), float(offset[1])]
+            part_data['target_offset'] = [float(offset[0]), float(offset[1])]
         parts.append(part_data)
 
-    if parts and not any(p['is_core'] for p in parts):
-        print(f"Warning: No core for battleship in level {level_config['level_number']}. Assigning first part as core.")
-        parts[0]['is_core'] = True
-
-    max_x = max(p['offset'][0] for p in parts) if parts else 0
-    max_y = max(p['offset'][1] for p in parts) if parts else 0
-
     battleship = {
         'status': 'passive', 'x': 0, 'y': 0, 'dx': 0,
-        'width': (max_x * INTERNAL_SPACE) + SIZE,
-        'height': (max_y * INTERNAL_SPACE) + SIZE,
+        'width': compiled_battleship['width'],
+        'height': compiled_battleship['height'],
         'parts': parts
     }
+    if compiled_battleship['is_level_4_boss']:
+        # The rows collapse towards the core's column as parts are shot off
+        core_index = compiled_battleship['core_flags'].index(True)
+        battleship['middle_col'] = compiled_battleship['offsets'][core_index][0]
     return battleship
 
 
+def create_battleship(level_config):
+    return build_battleship(compile_battleship(level_config))
+
+
+def compile_level(level_config):
+    """Everything setup_level needs from a level config, as plain data that round-trips through marshal."""
+    fleet = compile_fleet(level_config)
+    battleship = compile_battleship(level_config)
+    max_points = sum(fleet['shapes'][shape_index]['max_points'] for _, _, shape_index in fleet['drones'])
+    if battleship:
+        max_points += battleship['max_points']
+    return {
+        'level_number': level_config.get('level_number'),
+        'fleet_move_speed': level_config.get('fleet_move_speed', FLEET_MOVE_SPEED),
+        'fleet': fleet,
+        'battleship': battleship,
+        'max_points': max_points,
+    }
+
+
+# --- Level Pack ---
+# LEVEL_CONFIGS compiled into one record per level and cached on disk, keyed by a hash of
+# the source data. Only the small index is read up front; a level's record is read the
+# first time that level is set up. Set LEVEL_PACK_PATH to None to keep the pack in memory.
+LEVEL_PACK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "build", "levels.pack")
+LEVEL_PACK_MAGIC = b'RDLP'
+LEVEL_PACK_VERSION = 1
+LEVEL_PACK_HEADER = struct.Struct('<4sBI')  # magic, version, index size
+LEVEL_PACK = {'configs': None, 'path': None, 'data_start': 0, 'spans': None, 'max_points': [], 'levels': {}}
+
+
+def level_pack_key(level_configs):
+    source = (LEVEL_PACK_VERSION, marshal.version, level_configs, DRONE_SHAPES, SIZE, INTERNAL_SPACE, NUM_COLS,
+              FLEET_MOVE_SPEED, DRONE_PART_POINTS, DRONE_DESTROY_BONUS, BATTLESHIP_PART_POINTS,
+              BATTLESHIP_DESTROY_BONUS)
+    return hashlib.sha1(repr(source).encode()).hexdigest()
+
+
+def _read_level_pack_index(path, key):
+    try:
+        with open(path, 'rb') as f:
+            magic, version, index_size = LEVEL_PACK_HEADER.unpack(f.read(LEVEL_PACK_HEADER.size))
+            if magic != LEVEL_PACK_MAGIC or version != LEVEL_PACK_VERSION:
+                return None
+            index = marshal.loads(f.read(index_size))
+    except (OSError, EOFError, ValueError, TypeError, struct.error):
+        return None
+    if not isinstance(index, dict) or index.get('key') != key:
+        return None
+    index['data_start'] = LEVEL_PACK_HEADER.size + index_size
+    return index
+
+
+def _write_level_pack(path, key, levels):
+    blobs = [marshal.dumps(level) for level in levels]
+    spans, start = [], 0
+    for blob in blobs:
+        spans.append((start, len(blob)))
+        start += len(blob)
+    index = marshal.dumps({'key': key, 'spans': spans, 'max_points': [level['max_points'] for level in levels]})
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(LEVEL_PACK_HEADER.pack(LEVEL_PACK_MAGIC, LEVEL_PACK_VERSION, len(index)))
+        f.write(index)
+        f.write(b''.join(blobs))
+    os.replace(temp_path, path)
+
+
+def load_level_pack():
+    """
+    Makes LEVEL_PACK describe the current LEVEL_CONFIGS. Uses the pack on disk when it
+    matches, otherwise compiles every level and rewrites it.
+    """
+    if LEVEL_PACK['configs'] is LEVEL_CONFIGS:
+        return LEVEL_PACK
+
+    key = level_pack_key(LEVEL_CONFIGS)
+    index = _read_level_pack_index(LEVEL_PACK_PATH, key) if LEVEL_PACK_PATH else None
+    if index:
+        LEVEL_PACK.update(configs=LEVEL_CONFIGS, path=LEVEL_PACK_PATH, data_start=index['data_start'],
+                          spans=index['spans'], max_points=index['max_points'], levels={})
+        return LEVEL_PACK
+
+    levels = [compile_level(config) for config in LEVEL_CONFIGS]
+    LEVEL_PACK.update(configs=LEVEL_CONFIGS, path=None, data_start=0, spans=None,
+                      max_points=[level['max_points'] for level in levels], levels=dict(enumerate(levels)))
+    if LEVEL_PACK_PATH:
+        try:
+            _write_level_pack(LEVEL_PACK_PATH, key, levels)
+        except OSError as e:
+            print(f"Warning: Could not write the level pack to {LEVEL_PACK_PATH}. Error: {e}")
+    return LEVEL_PACK
+
+
+def get_compiled_level(level_idx):
+    pack = load_level_pack()
+    compiled = pack['levels'].get(level_idx)
+    if compiled is None:
+        start, size = pack['spans'][level_idx]
+        with open(pack['path'], 'rb') as f:
+            f.seek(pack['data_start'] + start)
+            compiled = marshal.loads(f.read(size))
+        pack['levels'][level_idx] = compiled
+    return compiled
+
+
+def count_alive_drones(fleet, fleet_state):
+    """(Re)counts the fleet-wide alive drones kept in fleet_state. Kills keep them current."""
+    fleet_state['alive_drones'] = sum(1 for d in fleet if d['status'] == 'alive')
+    fleet_state['alive_top_row'] = sum(1 for d in fleet if d['status'] == 'alive' and d['row'] == 0)
+
+
 def setup_level(level_idx):
-    config = LEVEL_CONFIGS[level_idx]
-    fleet = create_fleet(config)
-    battleship = create_battleship(config)
+    compiled = get_compiled_level(level_idx)
+    fleet = build_fleet(compiled['fleet'])
+    battleship = build_battleship(compiled['battleship'])
     initial_fleet_width = NUM_COLS * (DRONE_WIDTH + FLEET_SPACING) - FLEET_SPACING
     battleship['y'] = SIZE
     fleet_state = {
         'x': (CANVAS_WIDTH - initial_fleet_width) / 2,
         'y': battleship['y'] + battleship['height'] + BATTLESHIP_FLEET_GAP,
-        'dx': -config.get('fleet_move_speed', FLEET_MOVE_SPEED)
+        'dx': -compiled['fleet_move_speed'],
+        'hits': 0,  # drone parts destroyed so far
     }
     battleship['x'] = (CANVAS_WIDTH - battleship['width']) / 2
+    count_alive_drones(fleet, fleet_state)
     return fleet, battleship, fleet_state
 
 
+# --- Array-Backed Fleet ---
+# Struct-of-arrays mirror of a fleet: one entry per drone, parts padded to the largest
+# drone. Part status is a bitmask per drone (bit i set = part i alive). The drone dicts
+# stay the source of truth for scoring; per-tick movement, bounds, firing selection
+# and hit tests run on the arrays.
+WING_IDS = {'left': 0, 'right': 1, 'core': 2, 'body': 3}
+MAX_ARRAY_PARTS = 64
+
+
+def load_numpy():
+    """Imports NumPy into the module's np on first use and returns it."""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+def create_fleet_arrays(fleet):
+    """Builds the array view of a fleet, or returns None if a drone has too many parts for the bitmask."""
+    load_numpy()
+    max_parts = max((len(d['parts']) for d in fleet), default=0)
+    if max_parts > MAX_ARRAY_PARTS:
+        return None
+
+    num_drones = len(fleet)
+    part_offset = np.zeros((num_drones, max_parts, 2), dtype=np.float64)
+    part_wing = np.full((num_drones, max_parts), -1, dtype=np.int8)
+    part_status = np.zeros(num_drones, dtype=np.uint64)
+    for i, drone in enumerate(fleet):
+        for j, part in enumerate(drone['parts']):
+            part_offset[i, j] = part['offset']
+            part_wing[i, j] = WING_IDS.get(part['wing'], -1)
+            if part['status'] == 'alive':
+                part_status[i] |= np.uint64(1 << j)
+
+    return {
+        'drones': fleet,
+        'row': np.array([d['row'] for d in fleet], dtype=np.int16),
+        'col': np.array([d['col'] for d in fleet], dtype=np.int16),
+        'x': np.array([d['x'] for d in fleet], dtype=np.float64),
+        'y': np.array([d['y'] for d in fleet], dtype=np.float64),
+        'alive': np.array([d['status'] == 'alive' for d in fleet], dtype=bool),
+        'part_offset': part_offset,
+        'part_wing': part_wing,
+        'part_status': part_status,
+        'part_bits': np.arange(max_parts, dtype=np.uint64),
+    }
+
+
+def update_fleet_positions(fleet, fleet_state, fleet_arrays=None):
+    if fleet_arrays is not None:
+        fleet_arrays['x'] = fleet_state['x'] + fleet_arrays['col'] * (DRONE_WIDTH + FLEET_SPACING)
+        fleet_arrays['y'] = fleet_state['y'] + fleet_arrays['row'] * (DRONE_HEIGHT + FLEET_SPACING)
+        return
+
+    for drone in fleet:
+        drone['x'] = fleet_state['x'] + drone['col'] * (DRONE_WIDTH + FLEET_SPACING)
+        drone['y'] = fleet_state['y'] + drone['row'] * (DRONE_HEIGHT + FLEET_SPACING)
+
+
+def find_bottom_drones(fleet, fleet_arrays=None):
+    """Returns (row, col, x, y) for each alive drone at the bottom of its column, in fleet order."""
+    if fleet_arrays is not None:
+        alive = fleet_arrays['alive']
+        if not alive.any(): return []
+        rows, cols = fleet_arrays['row'].astype(np.int32), fleet_arrays['col'].astype(np.int32)
+        col_base = cols.min()
+        bottom_rows = np.full(cols.max() - col_base + 1, -1, dtype=np.int32)
+        np.maximum.at(bottom_rows, cols[alive] - col_base, rows[alive])
+        indices = np.flatnonzero(alive & (rows == bottom_rows[cols - col_base]))
+        return list(zip(rows[indices].tolist(), cols[indices].tolist(),
+                        fleet_arrays['x'][indices].tolist(), fleet_arrays['y'][indices].tolist()))
+
+    alive_drones = [d for d in fleet if d['status'] == 'alive']
+    if not alive_drones: return []
+    bottom_drones = {col: max(d['row'] for d in alive_drones if d['col'] == col) for col in
+                     {d['col'] for d in alive_drones}}
+    return [(d['row'], d['col'], d['x'], d['y']) for d in alive_drones if d['row'] == bottom_drones.get(d['col'])]
+
+
+def mark_part_destroyed(fleet_arrays, drone_index, part_index):
+    """Mirrors a hit already applied to the drone dicts into the arrays."""
+    fleet_arrays['part_status'][drone_index] &= ~np.uint64(1 << part_index)
+    fleet_arrays['alive'][drone_index] = fleet_arrays['drones'][drone_index]['status'] == 'alive'
+
+
+# --- Projectiles ---
+class Projectile:
+    __slots__ = ('rect', 'direction', 'owner', 'alive')
+
+    def __init__(self):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.direction = None
+        self.owner = None
+        self.alive = False
+
+
+class ProjectilePool:
+    """
+    Projectile store with separate 'up' (player) and 'down' (enemy) lanes. Records are
+    recycled instead of reallocated. kill() only marks a record; compact() drops the dead
+    ones once per tick, keeping firing order, so loops over a lane skip `not p.alive`.
+    """
+
+    def __init__(self):
+        self.up = []
+        self.down = []
+        self._free = []
+        self._dead = 0
+        self._owners = {}
+
+    def lane(self, direction):
+        return self.up if direction == 'up' else self.down
+
+    def acquire(self, x, y, width, height, direction, owner):
+        proj = self._free.pop() if self._free else Projectile()
+        proj.rect.update(x, y, width, height)
+        proj.direction, proj.owner, proj.alive = direction, owner, True
+        self.lane(direction).append(proj)
+        self._owners[owner] = self._owners.get(owner, 0) + 1
+        return proj
+
+    def kill(self, proj):
+        if not proj.alive: return
+        proj.alive = False
+        self._dead += 1
+        if self._owners[proj.owner] == 1:
+            del self._owners[proj.owner]
+        else:
+            self._owners[proj.owner] -= 1
+
+    def kill_lane(self, direction):
+        for proj in self.lane(direction):
+            self.kill(proj)
+
+    def has_owner(self, owner):
+        """True if a live projectile fired by owner is still in flight."""
+        return owner in self._owners
+
+    def has_alive(self, direction):
+        return any(p.alive for p in self.lane(direction))
+
+    def compact(self):
+        if not self._dead: return
+        for lane in (self.up, self.down):
+            alive = []
+            for proj in lane:
+                if proj.alive:
+                    alive.append(proj)
+                else:
+                    self._free.append(proj)
+            lane[:] = alive
+        self._dead = 0
+
+    def clear(self):
+        self.kill_lane('up')
+        self.kill_lane('down')
+        self.compact()
+
+    def __iter__(self):
+        for lane in (self.up, self.down):
+            for proj in lane:
+                if proj.alive:
+                    yield proj
+
+    def __len__(self):
+        return len(self.up) + len(self.down) - self._dead
+
+
 # --- Logic and Collision Functions ---
-def fire_projectile(owner_x, owner_y, owner_width, owner_height, direction, owner_id=None):
+def fire_projectile(projectiles, owner_x, owner_y, owner_width, owner_height, direction, owner_id=None):
     proj_x = owner_x + (owner_width / 2) - (SIZE / 4)
     proj_y = owner_y if direction == 'up' else owner_y + owner_height
-    rect = pygame.Rect(proj_x, proj_y, SIZE / 2, SIZE)
-    return {'rect': rect, 'direction': direction, 'owner': owner_id}
+    return projectiles.acquire(proj_x, proj_y, SIZE / 2, SIZE, direction, owner_id)
+
 
+def calculate_fleet_bounds(fleet, fleet_arrays=None):
+    if fleet_arrays is not None:
+        alive = fleet_arrays['alive']
+        if not alive.any(): return 0, 0
+        alive_x = fleet_arrays['x'][alive]
+        left_x = float(alive_x.min())
+        right_x = float((alive_x + DRONE_WIDTH).max())
+        return left_x, right_x - left_x
 
-def calculate_fleet_bounds(fleet):
     alive_drones = [d for d in fleet if d['status'] == 'alive']
     if not alive_drones: return 0, 0
     left_x = min(d['x'] for d in alive_drones)
@@ -778,101 +2227,143 @@ def calculate_fleet_bounds(fleet):
 def calculate_drone_score(drone):
     """Calculates the score for a destroyed drone based on how it was destroyed."""
     max_possible_score = len(drone['parts']) * DRONE_PART_POINTS + DRONE_DESTROY_BONUS
+    wing_parts, alive_wing_parts = drone['wing_parts'], drone['alive_wing_parts']
 
     # Rule 1 & 2: Perfect Kill (Core Shot)
-    if any(p['wing'] == 'core' and p['status'] == 'destroyed' for p in drone['parts']):
+    if alive_wing_parts.get('core', 0) < wing_parts.get('core', 0):
         if not drone['is_core_protected'] and drone['hit_count'] == 1:
             return max_possible_score
         if drone['is_core_protected'] and drone['hit_count'] == 2:
             return max_possible_score
 
     # Rule 3 & 4: Wing Destruction Kill & Score Degradation
-    base_score = sum(DRONE_PART_POINTS for p in drone['parts'] if p['status'] == 'destroyed') + DRONE_DESTROY_BONUS
+    destroyed_parts = len(drone['parts']) - sum(alive_wing_parts.values())
+    base_score = destroyed_parts * DRONE_PART_POINTS + DRONE_DESTROY_BONUS
 
     efficiency_bonus = 0
-    left_wing_destroyed = all(p['status'] == 'destroyed' for p in drone['parts'] if p['wing'] == 'left')
-    right_wing_destroyed = all(p['status'] == 'destroyed' for p in drone['parts'] if p['wing'] == 'right')
+    left_wing_destroyed = alive_wing_parts.get('left', 0) == 0
+    right_wing_destroyed = alive_wing_parts.get('right', 0) == 0
 
     if left_wing_destroyed and drone['hits_on_right_wing'] == 0:
-        efficiency_bonus = sum(
-            DRONE_PART_POINTS for p in drone['parts'] if p['wing'] == 'right' and p['status'] == 'alive') // 2
+        efficiency_bonus = alive_wing_parts.get('right', 0) * DRONE_PART_POINTS // 2
     elif right_wing_destroyed and drone['hits_on_left_wing'] == 0:
-        efficiency_bonus = sum(
-            DRONE_PART_POINTS for p in drone['parts'] if p['wing'] == 'left' and p['status'] == 'alive') // 2
+        efficiency_bonus = alive_wing_parts.get('left', 0) * DRONE_PART_POINTS // 2
 
     final_score = base_score + efficiency_bonus
 
-    # --- MODIFIED SECTION ---
-    left_wing_parts = sum(1 for p in drone['parts'] if p['wing'] == 'left')
-    right_wing_parts = sum(1 for p in drone['parts'] if p['wing'] == 'right')
-
-    # Consider only wings that actually exist
-    wing_part_counts = [count for count in [left_wing_parts, right_wing_parts] if count > 0]
-
-    # If there are wings, find the smallest wing. Otherwise, default to a high number.
-    min_hits_for_wing_kill = min(wing_part_counts) if wing_part_counts else 999
-    # --- END MODIFIED SECTION ---
-
-    min_hits_for_wing_kill = min(
-        sum(1 for p in drone['parts'] if p['wing'] == 'left'),
-        sum(1 for p in drone['parts'] if p['wing'] == 'right')
-    )
-
-    min_hits_needed = min_hits_for_wing_kill
-    if drone['is_core_protected']:
-        min_hits_needed = 2
-    else:
-        min_hits_needed = 1
-
+    min_hits_needed = 2 if drone['is_core_protected'] else 1
     wasted_hits = drone['hit_count'] - min_hits_needed
     penalty = wasted_hits * DRONE_PART_POINTS * 2
 
     return max(0, final_score - penalty)
 
 
-def handle_fleet_collisions(projectiles, fleet):
+# --- Broadphase ---
+# The formation moves as one rigid grid, so the drones a projectile can touch follow
+# from its position relative to fleet_state; only those slots are tested.
+FLEET_PITCH_X = DRONE_WIDTH + FLEET_SPACING
+FLEET_PITCH_Y = DRONE_HEIGHT + FLEET_SPACING
+# Below this many drones a plain scan of the fleet is cheaper than the slot lookup
+BROADPHASE_MIN_DRONES = 16
+
+
+def fleet_slots(fleet, fleet_state):
+    """
+    The formation as rows of drone indices, slots[row][col] (None where there is no
+    drone). Built once per level and kept in fleet_state; the formation never changes.
+    """
+    slots = fleet_state.get('slots')
+    if slots is None:
+        slots = [[None] * (max(d['col'] for d in fleet) + 1) for _ in range(max(d['row'] for d in fleet) + 1)] \
+            if fleet else []
+        for i, drone in enumerate(fleet):
+            slots[drone['row']][drone['col']] = i
+        fleet_state['slots'] = slots
+    return slots
+
+
+def candidate_drones(rect, fleet_state, slots):
+    """Indices, in fleet order, of the drones whose formation slot rect may overlap."""
+    # One pixel of slack either side covers drone rects truncated towards zero
+    fleet_x, fleet_y = fleet_state['x'], fleet_state['y']
+    first_row = max(int((rect.top - fleet_y - DRONE_HEIGHT - 1) // FLEET_PITCH_Y), 0)
+    last_row = int((rect.bottom - fleet_y + 1) // FLEET_PITCH_Y)
+    first_col = max(int((rect.left - fleet_x - DRONE_WIDTH - 1) // FLEET_PITCH_X), 0)
+    last_col = int((rect.right - fleet_x + 1) // FLEET_PITCH_X)
+    if last_row < first_row or last_col < first_col:
+        return ()
+    rows = slots[first_row:last_row + 1]
+    return sorted(i for row in rows for i in row[first_col:last_col + 1] if i is not None)
+
+
+def apply_drone_hit(drone, part, fleet_state):
+    """Destroys a drone part, updates the drone and fleet counters and returns the points earned."""
+    part['status'] = 'destroyed'
+    drone['alive_wing_parts'][part['wing']] -= 1
+    fleet_state['hits'] += 1
+
+    drone['hit_count'] += 1
+    if part['wing'] == 'left':
+        drone['hits_on_left_wing'] += 1
+    elif part['wing'] == 'right':
+        drone['hits_on_right_wing'] += 1
+
+    core_destroyed = (part['wing'] == 'core')
+    left_wing_destroyed = drone['alive_wing_parts'].get('left', 0) == 0
+    right_wing_destroyed = drone['alive_wing_parts'].get('right', 0) == 0
+
+    if core_destroyed or left_wing_destroyed or right_wing_destroyed:
+        drone['status'] = 'destroyed'
+        fleet_state['alive_drones'] -= 1
+        if drone['row'] == 0:
+            fleet_state['alive_top_row'] -= 1
+        return calculate_drone_score(drone)
+    return DRONE_PART_POINTS
+
+
+def _first_part_hit(drone, x, y, rect):
+    """The first alive part of the drone at (x, y) that rect overlaps, or None."""
+    for part in drone['parts']:
+        if part['status'] == 'alive' and rect.colliderect(
+                pygame.Rect(x + part['offset'][0] * INTERNAL_SPACE, y + part['offset'][1] * INTERNAL_SPACE, SIZE, SIZE)):
+            return part
+    return None
+
+
+def handle_fleet_collisions(projectiles, fleet, fleet_state, fleet_arrays=None):
     score_earned = 0
-    for proj in projectiles[:]:
-        if proj['direction'] != 'up': continue
-        hit = False
-        for drone in fleet:
+    if not projectiles.up:
+        return score_earned
+
+    slots = fleet_slots(fleet, fleet_state) if len(fleet) >= BROADPHASE_MIN_DRONES else None
+    for proj in projectiles.up:
+        if not proj.alive: continue
+
+        rect = proj.rect
+        candidates = enumerate(fleet) if slots is None else \
+            ((i, fleet[i]) for i in candidate_drones(rect, fleet_state, slots))
+        for drone_index, drone in candidates:
+            # An earlier projectile this tick may already have taken the drone
             if drone['status'] != 'alive': continue
+            if fleet_arrays is None:
+                x, y = drone['x'], drone['y']
+            else:
+                # Positions live in the arrays while playing
+                x, y = float(fleet_arrays['x'][drone_index]), float(fleet_arrays['y'][drone_index])
+            if not rect.colliderect(pygame.Rect(x, y, DRONE_WIDTH, DRONE_HEIGHT)): continue
+            part = _first_part_hit(drone, x, y, rect)
+            if part is None: continue
+
+            score_earned += apply_drone_hit(drone, part, fleet_state)
+            if fleet_arrays is not None:
+                mark_part_destroyed(fleet_arrays, drone_index, drone['parts'].index(part))
+            projectiles.kill(proj)
+            break
 
-            if proj['rect'].colliderect(pygame.Rect(drone['x'], drone['y'], DRONE_WIDTH, DRONE_HEIGHT)):
-                for part in drone['parts']:
-                    if part['status'] == 'alive':
-                        part_rect = pygame.Rect(drone['x'] + part['offset'][0] * INTERNAL_SPACE,
-                                                drone['y'] + part['offset'][1] * INTERNAL_SPACE, SIZE, SIZE)
-                        if proj['rect'].colliderect(part_rect):
-                            part['status'] = 'destroyed'
-                            projectiles.remove(proj)
-                            hit = True
-
-                            drone['hit_count'] += 1
-                            if part['wing'] == 'left':
-                                drone['hits_on_left_wing'] += 1
-                            elif part['wing'] == 'right':
-                                drone['hits_on_right_wing'] += 1
-
-                            core_destroyed = (part['wing'] == 'core')
-                            left_wing_destroyed = all(
-                                p['status'] == 'destroyed' for p in drone['parts'] if p['wing'] == 'left')
-                            right_wing_destroyed = all(
-                                p['status'] == 'destroyed' for p in drone['parts'] if p['wing'] == 'right')
-
-                            if core_destroyed or left_wing_destroyed or right_wing_destroyed:
-                                drone['status'] = 'destroyed'
-                                score_earned += calculate_drone_score(drone)
-                            else:
-                                score_earned += DRONE_PART_POINTS
-
-                            break
-            if hit:
-                break
     return score_earned
 
 
-def draw_static_blueprint(screen, boss_x, boss_y, original_shape_offsets, ghost_offset, color_with_alpha):
+def draw_static_blueprint(screen, boss_x, boss_y, original_shape_offsets, ghost_offset, color_with_alpha, scale=1):
     """
     Draws a static, non-interactive 'blueprint' of the boss.
     This shape is unchanging and simply moves with the boss's main coordinates.
@@ -881,16 +2372,18 @@ def draw_static_blueprint(screen, boss_x, boss_y, original_shape_offsets, ghost_
     blueprint_base_x = boss_x + ghost_offset[0]
     blueprint_base_y = boss_y + ghost_offset[1]
 
-    # To draw with transparency
-    part_surface = pygame.Surface((SIZE, SIZE), pygame.SRCALPHA)
-    part_surface.fill(color_with_alpha)
-
-    for part_offset in original_shape_offsets:
-        part_x = blueprint_base_x + part_offset[0] * INTERNAL_SPACE
-        part_y = blueprint_base_y + part_offset[1] * INTERNAL_SPACE
+    # Off the left edge each part is blitted on its own, truncated towards zero, as in draw_battleship
+    if blueprint_base_x < 0:
+        part_surface = get_translucent_layer(((0, 0),), color_with_alpha, SIZE * scale, INTERNAL_SPACE * scale)[0]
+        for part_offset in original_shape_offsets:
+            part_x = blueprint_base_x + part_offset[0] * INTERNAL_SPACE
+            part_y = blueprint_base_y + part_offset[1] * INTERNAL_SPACE
+            screen.blit(part_surface, (part_x * scale, part_y * scale))
+        return
 
-        # Blit the pre-made transparent surface onto the main screen for each part
-        screen.blit(part_surface, (part_x, part_y))
+    # The whole blueprint is baked into one translucent layer, so it costs a single alpha blit
+    layer = get_translucent_layer(original_shape_offsets, color_with_alpha, SIZE * scale, INTERNAL_SPACE * scale)
+    blit_sprite(screen, layer, blueprint_base_x, blueprint_base_y, scale)
 
 
 def animate_boss_parts(battleship):
@@ -919,9 +2412,10 @@ def animate_boss_parts(battleship):
                 part['visual_offset'][1] += norm_y * grid_speed
 
 
-def update_boss_shape(destroyed_part_offset, battleship):
+def update_boss_shape(destroyed_part_offset, battleship, rng=random):
     destroyed_x, destroyed_y = destroyed_part_offset
-    left_wing_cols, right_wing_cols, middle_col = range(0, 7), range(8, 15), 7
+    middle_col = battleship['middle_col']
+    left_wing_cols, right_wing_cols = range(0, middle_col), range(middle_col + 1, 2 * middle_col + 1)
 
     # Get all parts in the same row using their target_offset and a tolerance for floats
     row_parts = [p for p in battleship['parts'] if abs(p['target_offset'][1] - destroyed_y) < 0.1]
@@ -951,7 +2445,7 @@ def update_boss_shape(destroyed_part_offset, battleship):
         if not left_wing and not right_wing: return
 
         # Decide which wing should move to fill the gap
-        move_left = random.choice([True, False]) if len(left_wing) == len(right_wing) else len(left_wing) > len(
+        move_left = rng.choice([True, False]) if len(left_wing) == len(right_wing) else len(left_wing) > len(
             right_wing)
 
         wing_to_shift = left_wing if move_left else right_wing
@@ -962,19 +2456,19 @@ def update_boss_shape(destroyed_part_offset, battleship):
             part['target_offset'][0] += shift_direction
 
 
-def handle_level4_boss_collisions(projectiles, battleship):
+def handle_level4_boss_collisions(projectiles, battleship, rng=random):
     if battleship['status'] == 'destroyed': return False, 0
     score_earned = 0
     hit_registered = False
 
-    for proj in projectiles[:]:
-        if proj['direction'] == 'up':
+    for proj in projectiles.up:
+        if proj.alive:
             for part in battleship['parts'][:]:
                 if part['status'] != 'alive': continue
                 part_rect = pygame.Rect(battleship['x'] + part['visual_offset'][0] * INTERNAL_SPACE,
                                         battleship['y'] + part['visual_offset'][1] * INTERNAL_SPACE, SIZE, SIZE)
 
-                if proj['rect'].colliderect(part_rect):
+                if proj.rect.colliderect(part_rect):
                     hit_registered = True
                     score_earned += BATTLESHIP_PART_POINTS
 
@@ -983,31 +2477,190 @@ def handle_level4_boss_collisions(projectiles, battleship):
                         score_earned += BATTLESHIP_DESTROY_BONUS
                         break
 
-                    projectiles.remove(proj)
+                    projectiles.kill(proj)
                     # Use the part's up-to-date target position instead of its old one
                     part_target_offset = tuple(part['target_offset'])
                     battleship['parts'].remove(part)
-                    update_boss_shape(part_target_offset, battleship)
+                    update_boss_shape(part_target_offset, battleship, rng)
                     break
 
             if battleship['status'] == 'destroyed': break
     return hit_registered, score_earned
 
 
+# --- Array-Backed Boss ---
+# Struct-of-arrays mirror of a collapsing (level-4) boss: one entry per part in shape
+# order, plus a per-row index of the parts still attached. A hit only re-targets the
+# parts of its own row, and the glide of every row in motion towards its targets is a
+# single vectorized update. Same rules, RNG use and float arithmetic as the dict
+# versions above, so either storage plays a recording the same way.
+USE_ARRAY_BOSS = HAS_NUMPY
+
+
+def create_boss_arrays(battleship):
+    """Builds the array view of a collapsing boss, or returns None if it has no parts."""
+    load_numpy()
+    parts = battleship['parts']
+    if not parts:
+        return None
+
+    target = np.array([part['target_offset'] for part in parts], dtype=np.float64)
+    rows = {}
+    for i, part in enumerate(parts):
+        rows.setdefault(part['target_offset'][1], []).append(i)
+
+    return {
+        'parts': parts,
+        'middle_col': battleship['middle_col'],
+        'target': target,
+        'visual': np.array([part['visual_offset'] for part in parts], dtype=np.float64),
+        'attached': np.array([part['status'] == 'alive' for part in parts], dtype=bool),
+        'is_core': np.array([part['is_core'] for part in parts], dtype=bool),
+        'rows': rows,
+        'moving_rows': set(),
+        'row_sprites': {},
+    }
+
+
+def animate_boss_arrays(boss_arrays):
+    """animate_boss_parts for the array view; only rows that are still gliding are touched."""
+    moving_rows = boss_arrays['moving_rows']
+    if not moving_rows: return
+    grid_speed = FLEET_MOVE_SPEED * 2 / INTERNAL_SPACE
+    target, visual = boss_arrays['target'], boss_arrays['visual']
+
+    indices = np.array([i for row_y in moving_rows for i in boss_arrays['rows'][row_y]], dtype=np.intp)
+    direction = target[indices] - visual[indices]
+    is_moving = (np.abs(direction) > 0.01).any(axis=1)
+    indices, direction = indices[is_moving], direction[is_moving]
+    distance = np.sqrt(direction[:, 0] ** 2 + direction[:, 1] ** 2)
+
+    arrived = distance < grid_speed
+    visual[indices[arrived]] = target[indices[arrived]]
+    gliding = ~arrived
+    visual[indices[gliding]] += direction[gliding] / distance[gliding, None] * grid_speed
+
+    still_moving = indices[(np.abs(target[indices] - visual[indices]) > 0.01).any(axis=1)]
+    boss_arrays['moving_rows'] = set(target[still_moving, 1].tolist())
+
+
+def collapse_boss_row(boss_arrays, destroyed_x, row_y, rng=random):
+    """update_boss_shape for the array view: re-targets the rest of row_y after the part at destroyed_x is gone."""
+    middle_col = boss_arrays['middle_col']
+    target = boss_arrays['target']
+    row = np.array(boss_arrays['rows'][row_y], dtype=np.intp)
+    row_x = target[row, 0]
+    left_wing = row[(row_x >= 0) & (row_x < middle_col)]
+    right_wing = row[(row_x > middle_col) & (row_x <= 2 * middle_col)]
+
+    if 0 <= destroyed_x < middle_col:
+        # Close up from the center outwards
+        left_wing = left_wing[np.argsort(-target[left_wing, 0], kind='stable')]
+        target[left_wing, 0] = (middle_col - 1) - np.arange(left_wing.size, dtype=np.float64)
+    elif middle_col < destroyed_x <= 2 * middle_col:
+        right_wing = right_wing[np.argsort(target[right_wing, 0], kind='stable')]
+        target[right_wing, 0] = (middle_col + 1) + np.arange(right_wing.size, dtype=np.float64)
+    elif int(destroyed_x) == middle_col:
+        left_x, right_x = row[row_x < middle_col], row[row_x > middle_col]
+        if not left_x.size and not right_x.size: return
+        if left_x.size == right_x.size:
+            move_left = rng.choice([True, False])
+        else:
+            move_left = left_x.size > right_x.size
+        # The bigger wing steps one column towards the middle to fill the gap
+        if move_left:
+            target[left_x, 0] += 1
+        else:
+            target[right_x, 0] -= 1
+    else:
+        return
+
+    boss_arrays['moving_rows'].add(row_y)
+    boss_arrays['row_sprites'].pop(row_y, None)
+
+
+def handle_level4_boss_collisions_arrays(projectiles, battleship, boss_arrays, rng=random):
+    """Vectorized handle_level4_boss_collisions: same first-match order, tested against the arrays."""
+    if battleship['status'] == 'destroyed': return False, 0
+    score_earned = 0
+    hit_registered = False
+    attached, visual = boss_arrays['attached'], boss_arrays['visual']
+    # Hits only re-target parts, so the drawn positions hold for the whole pass.
+    # pygame.Rect truncates float coordinates, so do the same here
+    part_left = np.trunc(battleship['x'] + visual[:, 0] * INTERNAL_SPACE)
+    part_top = np.trunc(battleship['y'] + visual[:, 1] * INTERNAL_SPACE)
+
+    for proj in projectiles.up:
+        if not proj.alive: continue
+
+        rect = proj.rect
+        hits = np.flatnonzero(attached & (part_left < rect.right) & (part_left + SIZE > rect.left) &
+                              (part_top < rect.bottom) & (part_top + SIZE > rect.top))
+        if not hits.size: continue
+
+        part_index = int(hits[0])
+        hit_registered = True
+        score_earned += BATTLESHIP_PART_POINTS
+        if boss_arrays['is_core'][part_index]:
+            battleship['status'] = 'destroyed'
+            score_earned += BATTLESHIP_DESTROY_BONUS
+            break
+
+        projectiles.kill(proj)
+        destroyed_x, row_y = boss_arrays['target'][part_index].tolist()
+        attached[part_index] = False
+        boss_arrays['parts'][part_index]['status'] = 'destroyed'
+        boss_arrays['rows'][row_y].remove(part_index)
+        boss_arrays['row_sprites'].pop(row_y, None)
+        collapse_boss_row(boss_arrays, destroyed_x, row_y, rng)
+
+    return hit_registered, score_earned
+
+
+def draw_boss_arrays(screen, battleship, boss_arrays, scale=1):
+    """
+    Draws a collapsing boss from its array view: each settled row is one cached sprite,
+    only the parts of rows still gliding are drawn one by one.
+    """
+    base_x, base_y = battleship['x'], battleship['y']
+    visual, row_sprites, moving_rows = boss_arrays['visual'], boss_arrays['row_sprites'], boss_arrays['moving_rows']
+    if base_x < 0:
+        # Off the left edge every part is placed on its own, as in draw_battleship
+        moving_rows = {row_y for row_y, row in boss_arrays['rows'].items() if row}
+
+    for row_y, row in boss_arrays['rows'].items():
+        if not row or row_y in moving_rows: continue
+        # (scale, sprite) of the row as it was last drawn
+        cached = row_sprites.get(row_y)
+        if cached is None or cached[0] != scale:
+            layout = tuple((tuple(offset), True) for offset in visual[row].tolist())
+            cached = row_sprites[row_y] = (scale, _render_parts_sprite(layout, SIZE * scale, INTERNAL_SPACE * scale,
+                                                                       False))
+        blit_sprite(screen, cached[1], base_x, base_y, scale)
+
+    if moving_rows:
+        indices = np.array([i for row_y in moving_rows for i in boss_arrays['rows'][row_y]], dtype=np.intp)
+        xs = ((base_x + visual[indices, 0] * INTERNAL_SPACE) * scale).astype(np.int64).tolist()
+        ys = ((base_y + visual[indices, 1] * INTERNAL_SPACE) * scale).astype(np.int64).tolist()
+        part_surface = pygame.Surface((SIZE * scale, SIZE * scale))
+        part_surface.fill(COLOR_2)
+        screen.blits([(part_surface, position) for position in zip(xs, ys)], doreturn=False)
+
+
 def handle_battleship_collisions(projectiles, battleship):
     if battleship['status'] == 'destroyed': return False, 0
     hit_registered = False
     score_earned = 0
-    for proj in projectiles[:]:
-        if proj['direction'] == 'up':
+    for proj in projectiles.up:
+        if proj.alive:
             for part in battleship['parts']:
                 if part['status'] == 'alive':
                     part_rect = pygame.Rect(battleship['x'] + part['offset'][0] * INTERNAL_SPACE,
                                             battleship['y'] + part['offset'][1] * INTERNAL_SPACE, SIZE, SIZE)
-                    if proj['rect'].colliderect(part_rect):
+                    if proj.rect.colliderect(part_rect):
                         part['status'] = 'destroyed'
                         score_earned += BATTLESHIP_PART_POINTS
-                        projectiles.remove(proj)
+                        projectiles.kill(proj)
                         hit_registered = True
                         if part['is_core']:
                             battleship['status'] = 'destroyed'
@@ -1018,343 +2671,939 @@ def handle_battleship_collisions(projectiles, battleship):
 
 
 def handle_ship_collision(projectiles, ship_rect):
-    for proj in projectiles[:]:
-        if proj['direction'] == 'down' and ship_rect.colliderect(proj['rect']):
-            projectiles.remove(proj)
+    for proj in projectiles.down:
+        if proj.alive and ship_rect.colliderect(proj.rect):
+            projectiles.kill(proj)
             return True
     return False
 
 
 def handle_projectile_collisions(projectiles):
-    player_projs = [p for p in projectiles if p['direction'] == 'up']
-    enemy_projs = [p for p in projectiles if p['direction'] == 'down']
-    for p_proj in player_projs[:]:
-        for e_proj in enemy_projs[:]:
-            if p_proj in projectiles and e_proj in projectiles and p_proj['rect'].colliderect(e_proj['rect']):
-                projectiles.remove(p_proj)
-                projectiles.remove(e_proj)
-                break
-
-
-def update_battleship_status(battleship, fleet, hit_by_projectile, fleet_dx):
+    """
+    Cancels player shots against enemy shots with a sort-and-sweep on x: enemy shots are
+    sorted by left edge once, and each player shot only looks at those whose x-interval
+    can overlap its own. Of the ones it hits it takes the earliest fired, like a plain
+    nested scan in firing order would.
+    """
+    if not projectiles.has_alive('up'): return
+    enemy_projs = sorted((e.rect.left, i, e) for i, e in enumerate(projectiles.down) if e.alive)
+    if not enemy_projs: return
+    lefts = [left for left, _, _ in enemy_projs]
+    max_width = max(e.rect.width for _, _, e in enemy_projs)
+
+    for p_proj in projectiles.up:
+        if not p_proj.alive: continue
+        rect = p_proj.rect
+        first_hit = None
+        for k in range(bisect_right(lefts, rect.left - max_width), bisect_left(lefts, rect.right)):
+            _, fired_index, e_proj = enemy_projs[k]
+            if e_proj.alive and (first_hit is None or fired_index < first_hit[0]) and rect.colliderect(e_proj.rect):
+                first_hit = (fired_index, e_proj)
+        if first_hit:
+            projectiles.kill(p_proj)
+            projectiles.kill(first_hit[1])
+
+
+def update_battleship_status(battleship, fleet_state, hit_by_projectile):
     if battleship['status'] == 'passive':
-        alive_drones_exist = any(d['status'] == 'alive' for d in fleet)
+        alive_drones_exist = fleet_state['alive_drones'] > 0
         if not alive_drones_exist:
             battleship['status'] = 'active'
             battleship['dx'] = FLEET_MOVE_SPEED * BATTLESHIP_ACTIVE_SPEED_MULTIPLIER
         else:
-            alive_top_row_count = sum(1 for d in fleet if d['status'] == 'alive' and d['row'] == 0)
+            alive_top_row_count = fleet_state['alive_top_row']
             if hit_by_projectile or (alive_top_row_count < NUM_COLS):
                 battleship['status'] = 'active'
-                battleship['dx'] = fleet_dx * BATTLESHIP_ACTIVE_SPEED_MULTIPLIER
+                battleship['dx'] = fleet_state['dx'] * BATTLESHIP_ACTIVE_SPEED_MULTIPLIER
 
 
-async def _draw_animation_frame(screen, clock, battleship, ship_x, ship_y, drones_to_draw, moving_drone=None, is_level_4=False):
-    screen.fill(COLOR_1)
-    draw_battleship(screen, battleship, is_level_4)
-    draw_ship(screen, ship_x, ship_y)
-    for drone in drones_to_draw:
-        draw_drone(screen, drone)
-    if moving_drone:
-        draw_drone(screen, moving_drone)
-    pygame.display.flip()
+# --- Fleet Deployment ---
+# Deployment is a precomputed timeline. Each drone's flight (up from below the boss,
+# then sideways into its slot) starts the tick after the previous one lands; then the
+# two halves of the formation close in and the whole fleet rises into combat position.
+# Every tick's pose is looked up from the timeline, and landed drones are baked into
+# one layer per half, since each half moves as a single piece afterwards.
+DEPLOY_SPREAD_TICKS = 30
+DEPLOY_RISE_SPEED = 2
 
-    if IS_WEB_BUILD:
-        await asyncio.sleep(0)
-    else:
-        clock.tick(60)
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
+def _deploy_order(num_rows, num_cols):
+    """(row, col) in the order drones fly in: bottom row first, columns from the edges towards the middle."""
+    cols_order = []
+    left, right = list(range(num_cols // 2)), list(range(num_cols - 1, (num_cols // 2) - 1, -1))
+    for i in range(len(left)):
+        cols_order.extend([left[i], right[i]])
+    if num_cols % 2 != 0: cols_order.append(num_cols // 2)
+    return [(row, col) for row in range(num_rows - 1, -1, -1) for col in cols_order]
 
 
-async def run_deployment_animation(screen, clock, fleet, battleship, ship_x, ship_y, fleet_state, level_config):
+def deployment_timeline(fleet, battleship, fleet_state, level_config):
+    """Precomputes the deployment of a fleet into its formation below the battleship. Leaves the fleet untouched."""
     if not fleet and not battleship.get('parts'):
-        await _draw_animation_frame(screen, clock, battleship, ship_x, ship_y, [], None, level_config['level_number'] == 4)
-        if IS_WEB_BUILD: await asyncio.sleep(1.5)
-        else: pygame.time.wait(1500)
-        return
+        # Nothing to fly in: one frame, then hold the empty board for 1.5 seconds
+        return {'flights': [], 'flight_starts': [], 'flights_end': 0, 'landing_order': [], 'slots': {},
+                'spread_step': 0, 'spread_ticks': 0, 'rise_ticks': 0, 'total_ticks': 1 + int(1.5 * 60)}
 
-    is_level_4 = level_config['level_number'] == 4
-    num_rows_in_level = level_config.get('num_rows', NUM_ROWS)
-    deployed_drones = []
-    animation_move_speed = DEPLOY_SPEED
     gap_width = DRONE_WIDTH + FLEET_SPACING
     deployment_y_start = fleet_state['y'] + DRONE_HEIGHT + FLEET_SPACING
+    drones_by_cell = {}
+    for drone in fleet:
+        drones_by_cell.setdefault((drone['row'], drone['col']), drone)
 
-    final_drone_positions = {}
+    # Slots are spaced half a gap wider than the combat formation; the halves close in afterwards
+    slots = {}
     for drone in fleet:
         col = drone['col']
-        final_x = fleet_state['x'] + col * gap_width - (gap_width / 2) if col < NUM_COLS / 2 else \
+        slot_x = fleet_state['x'] + col * gap_width - (gap_width / 2) if col < NUM_COLS / 2 else \
             fleet_state['x'] + col * gap_width + (gap_width / 2)
-        final_y = deployment_y_start + drone['row'] * (DRONE_HEIGHT + FLEET_SPACING)
-        final_drone_positions[(drone['row'], drone['col'])] = (final_x, final_y)
+        slots[id(drone)] = (slot_x, deployment_y_start + drone['row'] * (DRONE_HEIGHT + FLEET_SPACING))
+
+    start_x = CANVAS_WIDTH / 2 - DRONE_WIDTH / 2
+    start_y = battleship['y'] + battleship['height'] + SIZE
+    flights, tick = [], 0
+    for cell in _deploy_order(level_config.get('num_rows', NUM_ROWS), NUM_COLS):
+        drone = drones_by_cell.get(cell)
+        if drone is None: continue
+        target_x, target_y = slots[id(drone)]
+        climb_ticks = math.ceil((target_y - start_y) / DEPLOY_SPEED) if target_y > start_y else 0
+        flights.append({
+            'drone': drone, 'start_tick': tick, 'start': (start_x, start_y), 'target': (target_x, target_y),
+            'climb_ticks': climb_ticks,
+            'slide_ticks': math.ceil(abs(target_x - start_x) / DEPLOY_SPEED),
+            'slide_y': target_y if climb_ticks else start_y,
+            'direction': 1 if target_x > start_x else -1,
+        })
+        tick += flights[-1]['climb_ticks'] + flights[-1]['slide_ticks']
+
+    # Drones outside the deployment grid don't fly; they join the formation where they are
+    flown = {id(flight['drone']) for flight in flights}
+    for drone in fleet:
+        if id(drone) not in flown:
+            slots[id(drone)] = (drone['x'], drone['y'])
 
-    cols_order = []
-    left, right = list(range(NUM_COLS // 2)), list(range(NUM_COLS - 1, (NUM_COLS // 2) - 1, -1))
-    for i in range(len(left)):
-        cols_order.extend([left[i], right[i]])
-    if NUM_COLS % 2 != 0: cols_order.append(NUM_COLS // 2)
+    rise_ticks = 0
+    if fleet:
+        final_combat_y = battleship['y'] + battleship['height'] + BATTLESHIP_FLEET_GAP
+        rise_ticks = max(0, math.ceil((slots[id(fleet[0])][1] - final_combat_y) / DEPLOY_RISE_SPEED))
+
+    spread_ticks = DEPLOY_SPREAD_TICKS if fleet else 0
+    return {
+        'flights': flights,
+        'flight_starts': [flight['start_tick'] for flight in flights],
+        'flights_end': tick,
+        'landing_order': [flight['drone'] for flight in flights] + [d for d in fleet if id(d) not in flown],
+        'slots': slots,
+        'spread_step': gap_width / 60,
+        'spread_ticks': spread_ticks,
+        'rise_ticks': rise_ticks,
+        'total_ticks': tick + spread_ticks + rise_ticks,
+    }
 
-    for row in range(num_rows_in_level - 1, -1, -1):
-        for col in cols_order:
-            drone_to_deploy_list = [d for d in fleet if d['row'] == row and d['col'] == col]
-            if not drone_to_deploy_list: continue
 
-            drone_to_deploy = drone_to_deploy_list[0]
-            start_pos_y = battleship['y'] + battleship['height'] + SIZE
-            center_x = CANVAS_WIDTH / 2 - DRONE_WIDTH / 2
-            target_x, target_y = final_drone_positions[(row, col)]
-            moving_drone = {'x': center_x, 'y': start_pos_y, 'parts': drone_to_deploy['parts'], 'status': 'alive'}
+def deployment_pose(timeline, tick):
+    """
+    What deployment tick `tick` (1-based) shows: (landed, moving, offset). The first
+    `landed` drones of the landing order are in formation; moving is (drone, x, y) for
+    the drone in flight, if any; offset is (spread_x, rise_y), how far the left half has
+    moved in (the right half mirrors it) and the formation has risen.
+    """
+    frame = tick - 1
+    if frame < timeline['flights_end']:
+        index = bisect_right(timeline['flight_starts'], frame) - 1
+        flight = timeline['flights'][index]
+        step = frame - flight['start_tick'] + 1
+        (start_x, start_y), (target_x, target_y) = flight['start'], flight['target']
+        if step <= flight['climb_ticks']:
+            position = (start_x, min(target_y, start_y + step * DEPLOY_SPEED))
+        else:
+            x = start_x + (step - flight['climb_ticks']) * DEPLOY_SPEED * flight['direction']
+            if (target_x - x) * flight['direction'] <= 0: x = target_x
+            position = (x, flight['slide_y'])
+        return index, (flight['drone'],) + position, (0, 0)
 
-            while moving_drone['y'] < target_y:
-                moving_drone['y'] = min(target_y, moving_drone['y'] + animation_move_speed)
-                await _draw_animation_frame(screen, clock, battleship, ship_x, ship_y, deployed_drones, moving_drone, is_level_4)
+    frame -= timeline['flights_end']
+    spread = min(frame + 1, timeline['spread_ticks'])
+    rise = max(0, frame + 1 - timeline['spread_ticks'])
+    return len(timeline['landing_order']), None, (spread * timeline['spread_step'], -rise * DEPLOY_RISE_SPEED)
 
-            move_dir = 1 if target_x > moving_drone['x'] else -1
-            while (target_x - moving_drone['x']) * move_dir > 0:
-                moving_drone['x'] += animation_move_speed * move_dir
-                if (target_x - moving_drone['x']) * move_dir <= 0: moving_drone['x'] = target_x
-                await _draw_animation_frame(screen, clock, battleship, ship_x, ship_y, deployed_drones, moving_drone, is_level_4)
 
-            drone_to_deploy['x'], drone_to_deploy['y'] = target_x, target_y
-            deployed_drones.append(drone_to_deploy)
+def create_formation_layers(timeline, scale=1):
+    """
+    One empty layer per half of the formation, sized to the slots of its drones. A fresh
+    fleet has no translucent (destroyed) parts, so the layers are colour-keyed with
+    RLE acceleration rather than per-pixel alpha: their empty space costs nothing to blit.
+    """
+    layers = {}
+    for side in ('left', 'right'):
+        slots = [timeline['slots'][id(d)] for d in timeline['landing_order'] if _formation_side(d) == side]
+        if not slots: continue
+        left, top = int(min(x for x, _ in slots) * scale), int(min(y for _, y in slots) * scale)
+        width = int(max(x for x, _ in slots) * scale) - left + int(DRONE_WIDTH * scale) + 1
+        height = int(max(y for _, y in slots) * scale) - top + int(DRONE_HEIGHT * scale) + 1
+        layer = pygame.Surface((width, height))
+        layer.fill(COLOR_1)
+        layer.set_colorkey(COLOR_1, pygame.RLEACCEL)
+        layers[side] = (layer, (left, top))
+    return layers
+
+
+def _formation_side(drone):
+    return 'left' if drone['col'] < NUM_COLS / 2 else 'right'
+
+
+class DeploymentScene(Scene):
+    render_divisor = RENDER_DIVISOR
+
+    def __init__(self, state):
+        super().__init__()
+        self.battleship, self.boss_arrays = state['battleship'], state['boss_arrays']
+        self.ship_x, self.ship_y = state['ship_x'], state['ship_y']
+        level_config = LEVEL_CONFIGS[state['level_index']]
+        self.is_level_4 = level_config['level_number'] == 4
+        # The animation flies the drones in; the combat formation itself stays as start_level set it
+        self.timeline = deployment_timeline(state['fleet'], self.battleship, state['fleet_state'], level_config)
+        self.scale = 1 / self.render_divisor
+        self.layers = create_formation_layers(self.timeline, self.scale)
+        self.landed = 0
+        self.tick = 0
+
+    def update(self):
+        self.tick += 1
+        self.done = self.tick > self.timeline['total_ticks']
+
+    def land(self, landed):
+        """Stamps the drones that landed since the last frame into their half's layer."""
+        for drone in self.timeline['landing_order'][self.landed:landed]:
+            layer, (left, top) = self.layers[_formation_side(drone)]
+            slot_x, slot_y = self.timeline['slots'][id(drone)]
+            # Layer positions are in framebuffer pixels, the slot is in canvas ones
+            sprite, (origin_x, origin_y), _ = get_entity_sprite(drone['parts'], scale=self.scale)
+            layer.blit(sprite, (int(slot_x * self.scale) - left + origin_x, int(slot_y * self.scale) - top + origin_y))
+        self.landed = max(self.landed, landed)
+
+    def draw(self, screen):
+        if self.tick == 0 or self.done:
+            return []
+        landed, moving, (spread_x, rise_y) = deployment_pose(self.timeline, self.tick)
+        self.land(landed)
+
+        scale = self.scale
+        screen.fill(COLOR_1)
+        draw_battleship(screen, self.battleship, self.is_level_4, self.boss_arrays, scale)
+        draw_ship(screen, self.ship_x, self.ship_y, scale)
+        for side, (layer, (left, top)) in self.layers.items():
+            screen.blit(layer, (left + (spread_x if side == 'left' else -spread_x) * scale, top + rise_y * scale))
+        if moving:
+            drone, x, y = moving
+            blit_sprite(screen, get_entity_sprite(drone['parts'], scale=scale), x, y, scale)
+        return None
+
+
+# --- Simulation Core ---
+# The game rules live in step(), which advances a state dict by one fixed tick and
+# never touches the display. main() is a thin shell that turns pygame events into
+# inputs, calls step() and draws the result; run_headless() drives the same core
+# without any window, e.g. for balance checks or regression runs in CI.
+NO_INPUT = {'left': False, 'right': False, 'fire': False}
+
+
+def compute_total_game_points():
+    return sum(load_level_pack()['max_points'])
+
+
+def start_level(state, level_idx):
+    """Sets up a level with the fleet already in its combat formation."""
+    fleet, battleship, fleet_state = setup_level(level_idx)
+    update_fleet_positions(fleet, fleet_state)
+    is_level_4 = LEVEL_CONFIGS[level_idx]['level_number'] == 4
+    use_fleet_arrays = USE_ARRAY_FLEET and len(fleet) >= ARRAY_FLEET_MIN_DRONES
+    state.update({
+        'mode': 'playing',
+        'level_index': level_idx,
+        'fleet': fleet,
+        'battleship': battleship,
+        'fleet_state': fleet_state,
+        'fleet_arrays': create_fleet_arrays(fleet) if use_fleet_arrays else None,
+        'boss_arrays': create_boss_arrays(battleship) if USE_ARRAY_BOSS and is_level_4 else None,
+        'ship_x': (CANVAS_WIDTH - SHIP_WIDTH) / 2,
+    })
+    state['projectiles'].clear()
+
+
+def create_game_state(total_game_points=None, seed=None):
+    """A fresh game on level 1. All of its randomness comes from its own RNG seeded with `seed`."""
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    state = {
+        'seed': seed,
+        'rng': random.Random(seed),
+        'raw_score': 0,
+        'lives': PLAYER_LIVES,
+        'total_game_points': compute_total_game_points() if total_game_points is None else total_game_points,
+        'projectiles': ProjectilePool(),
+        'ship_y': CANVAS_HEIGHT - (4 * SIZE) - SHIP_HEIGHT,
+        'tick': 0,
+    }
+    start_level(state, 0)
+    return state
 
-    if fleet:
-        for i in range(30):
-            for drone in fleet:
-                drone['x'] += (gap_width / 60) if drone['col'] < NUM_COLS / 2 else -(gap_width / 60)
-            await _draw_animation_frame(screen, clock, battleship, ship_x, ship_y, fleet, None, is_level_4=is_level_4)
 
-        fleet_state['x'] = fleet[0]['x'] - fleet[0]['col'] * (DRONE_WIDTH + FLEET_SPACING)
-        final_combat_y = battleship['y'] + battleship['height'] + BATTLESHIP_FLEET_GAP
-        current_fleet_y = fleet[0]['y']
+def advance_level(state):
+    """Moves on from a completed level. Returns False (and switches to 'win') after the last one."""
+    if state['level_index'] == len(LEVEL_CONFIGS) - 1:
+        state['mode'] = 'win'
+        return False
+    start_level(state, state['level_index'] + 1)
+    return True
 
-        while current_fleet_y > final_combat_y:
-            y_change = -2
-            current_fleet_y += y_change
-            for drone in fleet: drone['y'] += y_change
-            await _draw_animation_frame(screen, clock, battleship, ship_x, ship_y, fleet, None, is_level_4=is_level_4)
 
-        y_correction = final_combat_y - current_fleet_y
-        for drone in fleet: drone['y'] += y_correction
-        if fleet:
-            fleet_state['y'] = fleet[0]['y'] - fleet[0]['row'] * (DRONE_HEIGHT + FLEET_SPACING)
+def step(state, inputs):
+    """
+    Advances a 'playing' state by one fixed tick. `inputs` holds 'left' and 'right'
+    (keys held) and 'fire' (fire pressed this tick). Returns the list of events that
+    happened during the tick, e.g. 'life_lost', for the caller to react to.
+    """
+    events = []
+    fleet, battleship, fleet_state = state['fleet'], state['battleship'], state['fleet_state']
+    fleet_arrays, boss_arrays = state['fleet_arrays'], state['boss_arrays']
+    projectiles, rng = state['projectiles'], state['rng']
+    is_level_4 = LEVEL_CONFIGS[state['level_index']]['level_number'] == 4
+    state['tick'] += 1
+
+    if is_level_4:
+        with PROFILER.section('boss_animation'):
+            if boss_arrays is not None:
+                animate_boss_arrays(boss_arrays)
+            else:
+                animate_boss_parts(battleship)
+
+    player_can_fire = not projectiles.has_alive('up')
+    if inputs['fire'] and player_can_fire:
+        fire_projectile(projectiles, state['ship_x'], state['ship_y'], SHIP_WIDTH, SHIP_HEIGHT, 'up', 'player')
+
+    state['ship_x'] += (inputs['right'] - inputs['left']) * SHIP_MOVE_SPEED
+
+    if fleet and fleet_state['dx'] != 0:
+        with PROFILER.section('fleet_movement'):
+            fleet_state['x'] += fleet_state['dx']
+            update_fleet_positions(fleet, fleet_state, fleet_arrays)
+            fleet_left_edge, current_fleet_width = calculate_fleet_bounds(fleet, fleet_arrays)
+            if current_fleet_width > 0 and (
+                    fleet_left_edge <= SPACE or (
+                    fleet_left_edge + current_fleet_width) >= CANVAS_WIDTH - SPACE):
+                fleet_state['dx'] *= -1
+
+    with PROFILER.section('boss_collisions'):
+        if boss_arrays is not None:
+            battleship_was_hit, score_from_battleship = handle_level4_boss_collisions_arrays(
+                projectiles, battleship, boss_arrays, rng)
+        elif is_level_4:
+            battleship_was_hit, score_from_battleship = handle_level4_boss_collisions(projectiles, battleship, rng)
+        else:
+            battleship_was_hit, score_from_battleship = handle_battleship_collisions(projectiles, battleship)
+
+    state['raw_score'] += score_from_battleship
+    with PROFILER.section('fleet_collisions'):
+        state['raw_score'] += handle_fleet_collisions(projectiles, fleet, fleet_state, fleet_arrays)
+    update_battleship_status(battleship, fleet_state, battleship_was_hit)
+    with PROFILER.section('projectile_collisions'):
+        handle_projectile_collisions(projectiles)
+
+    with PROFILER.section('ship_collision'):
+        ship_hit = handle_ship_collision(projectiles,
+                                         pygame.Rect(state['ship_x'], state['ship_y'], SHIP_WIDTH, SHIP_HEIGHT))
+    if ship_hit:
+        state['lives'] -= 1
+        if state['lives'] < 0:
+            state['mode'] = "game_over"
+        else:
+            state['ship_x'] = (CANVAS_WIDTH - SHIP_WIDTH) / 2
+            projectiles.kill_lane('down')
+            events.append('life_lost')
 
+    fleet_left_edge, current_fleet_width = calculate_fleet_bounds(fleet, fleet_arrays)
+    if battleship['status'] == 'passive' and current_fleet_width > 0:
+        battleship['x'] = fleet_left_edge + (current_fleet_width / 2) - (battleship['width'] / 2)
+    else:
+        battleship['x'] += battleship.get('dx', 0)
+
+    for lane, speed in ((projectiles.up, -SHIP_PROJECTILE_SPEED), (projectiles.down, DRONE_PROJECTILE_SPEED)):
+        for proj in lane:
+            if not proj.alive: continue
+            proj.rect.y += speed
+            if not (0 < proj.rect.bottom and proj.rect.top < CANVAS_HEIGHT):
+                projectiles.kill(proj)
+
+    state['ship_x'] = max(SPACE / 2, min(state['ship_x'], CANVAS_WIDTH - SHIP_WIDTH - SPACE / 2))
+
+    for row, col, drone_x, drone_y in find_bottom_drones(fleet, fleet_arrays):
+        if rng.random() < DRONE_FIRE_CHANCE:
+            if not projectiles.has_owner((row, col)):
+                fire_projectile(projectiles, drone_x, drone_y, DRONE_WIDTH, DRONE_HEIGHT, 'down', (row, col))
+
+    if battleship['status'] == 'active' and battleship[
+        'status'] != 'destroyed' and rng.random() < BATTLESHIP_FIRE_CHANCE:
+        fire_projectile(projectiles, battleship['x'], battleship['y'], battleship['width'], battleship['height'],
+                        'down',
+                        'battleship')
+
+    if battleship['status'] == 'active':
+        if battleship['x'] > CANVAS_WIDTH:
+            battleship['x'] = -battleship['width']
+        elif battleship['x'] + battleship['width'] < 0:
+            battleship['x'] = CANVAS_WIDTH
+
+    if fleet_state['alive_drones'] == 0:
+        all_parts_gone = not any(p['status'] == 'alive' for p in battleship.get('parts', []))
+        core_destroyed = battleship['status'] == 'destroyed'
+        if all_parts_gone or core_destroyed:
+            state['mode'] = "level_complete"
+
+    # Dead projectiles are only marked during the tick; drop them all in one pass
+    projectiles.compact()
+    return events
+
+
+def autopilot(state):
+    """
+    A simple scripted pilot: sidesteps enemy shots that are about to land, otherwise
+    steers under the lowest alive drone (or the boss) and fires when lined up.
+    """
+    ship_x, ship_y = state['ship_x'], state['ship_y']
+    ship_center = ship_x + SHIP_WIDTH / 2
+
+    threats = [p.rect for p in state['projectiles'].down if p.alive
+               and ship_y - 20 * DRONE_PROJECTILE_SPEED < p.rect.bottom < ship_y + SHIP_HEIGHT
+               and ship_x - SIZE < p.rect.centerx < ship_x + SHIP_WIDTH + SIZE]
+    if threats:
+        closest = max(threats, key=lambda r: r.bottom)
+        dodge_right = closest.centerx < ship_center
+        if ship_x + SHIP_WIDTH + SHIP_MOVE_SPEED > CANVAS_WIDTH - SPACE / 2 or ship_x - SHIP_MOVE_SPEED < SPACE / 2:
+            dodge_right = ship_center < CANVAS_WIDTH / 2
+        return {'left': not dodge_right, 'right': dodge_right, 'fire': False}
+
+    # Aim where the target will be once the shot has travelled up to it
+    target_x = None
+    battleship = state['battleship']
+    bottom_drones = find_bottom_drones(state['fleet'], state['fleet_arrays'])
+    if bottom_drones:
+        _, _, drone_x, drone_y = max(bottom_drones, key=lambda d: (d[3], -abs(d[2] + DRONE_WIDTH / 2 - ship_center)))
+        travel_ticks = (ship_y - drone_y - DRONE_HEIGHT / 2) / SHIP_PROJECTILE_SPEED
+        target_x = drone_x + DRONE_WIDTH / 2 + state['fleet_state']['dx'] * travel_ticks
+    elif battleship['status'] != 'destroyed' and battleship.get('parts'):
+        travel_ticks = (ship_y - battleship['y'] - battleship['height'] / 2) / SHIP_PROJECTILE_SPEED
+        target_x = battleship['x'] + battleship['width'] / 2 + battleship.get('dx', 0) * travel_ticks
+
+    if target_x is None:
+        return dict(NO_INPUT)
+    return {
+        'left': target_x < ship_center - SHIP_MOVE_SPEED,
+        'right': target_x > ship_center + SHIP_MOVE_SPEED,
+        'fire': abs(target_x - ship_center) < SIZE,
+    }
 
-# --- Main Game ---
-async def main():
-    pygame.init()
-    screen = pygame.display.set_mode((CANVAS_WIDTH, CANVAS_HEIGHT))
-    pygame.display.set_caption("RADIANT")
-    clock = pygame.time.Clock()
-    fonts = load_fonts()
 
-    cover_image_surface = None
-    try:
-        # Load the image from the file
-        loaded_image = pygame.image.load("cover_image.png").convert()
-        # Scale it to fit the screen perfectly
-        cover_image_surface = pygame.transform.scale(loaded_image, (CANVAS_WIDTH, CANVAS_HEIGHT))
-    except pygame.error as e:
-        print(f"Warning: Could not load cover_image.png. Skipping cover screen. Error: {e}")
+def run_headless(pilot=autopilot, max_ticks=TICK_RATE * 60 * 30, state=None, seed=None):
+    """
+    Plays a whole game through step() with no display, as fast as the CPU allows.
+    Stops at 'win', 'game_over' or after max_ticks, and returns the final state.
+    """
+    if state is None:
+        state = create_game_state(seed=seed)
+    while state['mode'] not in ("win", "game_over") and state['tick'] < max_ticks:
+        if state['mode'] == "level_complete":
+            advance_level(state)
+            continue
+        step(state, pilot(state) if pilot else NO_INPUT)
+    return state
 
-    # 2. Show the cover screen if the image was loaded successfully
-    if cover_image_surface:
-        # Show for a maximum of 5 seconds or until a key is pressed
-        await show_cover_screen(screen, clock, cover_image_surface, 5)
 
-    await run_scrolling_text_animation(screen, clock, fonts, STORY_TEXTS['intro'].splitlines())
-    total_game_points = 0
-    for config in LEVEL_CONFIGS:
-        temp_fleet = create_fleet(config)
-        temp_battleship = create_battleship(config)
-        for drone in temp_fleet:
+# --- Input Recording ---
+# A recording is the game's seed plus its per-tick inputs, run-length encoded
+REPLAY_MAGIC = b'RDRP'
+REPLAY_VERSION = 2
+REPLAY_HEADER = struct.Struct('<4sBqIq20s')  # magic, version, seed, ticks, final score, final state hash
+SEED_RANGE = (-2 ** 63, 2 ** 63 - 1)  # what the header's signed 64-bit seed field holds
+REPLAY_RUN = struct.Struct('<BH')  # input bits, number of consecutive ticks they were held
+INPUT_BITS = (('left', 1), ('right', 2), ('fire', 4))
 
-            total_game_points += len(drone['parts']) * DRONE_PART_POINTS + DRONE_DESTROY_BONUS
-        if temp_battleship and temp_battleship.get('parts'):
 
-            total_game_points += len(temp_battleship['parts']) * BATTLESHIP_PART_POINTS + BATTLESHIP_DESTROY_BONUS
+def encode_inputs(inputs):
+    return sum(bit for key, bit in INPUT_BITS if inputs[key])
 
-    while True:
-        raw_score = 0
-        current_level_index = 0
-        player_lives = PLAYER_LIVES
-        game_state = "intro"  # Start with the intro screen
-        projectiles = []
-
-        fleet, battleship, fleet_state = setup_level(current_level_index)
-        ship_width, ship_height = 5 * SIZE, 4 * SIZE
-        ship_x, ship_y = (CANVAS_WIDTH - ship_width) / 2, CANVAS_HEIGHT - (4 * SIZE) - ship_height
-
-        running = True
-        while running:
-            # --- State Machine Logic ---
-            if game_state == "intro":
-                game_state = "playing"
-                await run_deployment_animation(screen, clock, fleet, battleship, ship_x, ship_y, fleet_state,
-                                         LEVEL_CONFIGS[current_level_index])
-
-            elif game_state == "level_complete":
-                # Check if the level we just finished is the last one in our list
-                is_last_level = (current_level_index == len(LEVEL_CONFIGS) - 1)
-
-                if is_last_level:
-                    # If it's the last level, go directly to the win screen
-                    game_state = "win"
 
-                else:
-                    # Otherwise, for any other level, show the complete screen
-                    await show_level_complete_screen(screen, clock, fonts, current_level_index + 1, player_lives, raw_score, total_game_points)
-                    current_level_index += 1
-                    # Set up the next level to play
-                    fleet, battleship, fleet_state = setup_level(current_level_index)
-                    projectiles.clear()
-                    ship_x = (CANVAS_WIDTH - ship_width) / 2
-                    game_state = "playing"
-                    await run_deployment_animation(screen, clock, fleet, battleship, ship_x, ship_y, fleet_state, LEVEL_CONFIGS[current_level_index])
-
-            elif game_state in ["win", "game_over"]:
-                if await show_outro_screen(screen, clock, fonts, game_state, raw_score, total_game_points):
-                    running = False  # Break from inner loop to restart game
-                else:
-                    pygame.quit()  # Quit entirely
-                    sys.exit()
+def decode_inputs(bits):
+    return {key: bool(bits & bit) for key, bit in INPUT_BITS}
 
-            elif game_state == "playing":
-                # --- Original Game Logic (restored) ---
-                current_level_config = LEVEL_CONFIGS[current_level_index]
-                is_level_4 = current_level_config['level_number'] == 4
 
-                if is_level_4:
-                    animate_boss_parts(battleship)
+def state_hash(state):
+    """Digest of the simulated game state, independent of the fleet and boss storage in use."""
+    battleship, boss_arrays = state['battleship'], state['boss_arrays']
+    if boss_arrays is not None:
+        attached = np.flatnonzero(boss_arrays['attached'])
+        boss_parts = [(boss_arrays['parts'][i]['status'], tuple(target), tuple(visual)) for i, target, visual in
+                      zip(attached.tolist(), boss_arrays['target'][attached].tolist(),
+                          boss_arrays['visual'][attached].tolist())]
+    else:
+        boss_parts = [(p['status'], tuple(p.get('target_offset', p['offset'])),
+                       tuple(p.get('visual_offset', p['offset']))) for p in battleship.get('parts', [])]
+    snapshot = (
+        state['mode'], state['level_index'], state['tick'], state['lives'], state['raw_score'], state['ship_x'],
+        [(key, state['fleet_state'][key]) for key in ('dx', 'x', 'y')],
+        [(d['status'], [p['status'] for p in d['parts']]) for d in state['fleet']],
+        (battleship['status'], battleship['x'], battleship.get('dx', 0), boss_parts),
+        [(tuple(p.rect), p.direction, p.owner) for p in state['projectiles']],
+    )
+    return hashlib.sha1(repr(snapshot).encode()).digest()
+
 
-                player_can_fire = not any(p['direction'] == 'up' for p in projectiles)
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                    # Using K_UP as per original code
-                    if event.type == pygame.KEYDOWN and event.key == pygame.K_UP and player_can_fire:
-                        projectiles.append(fire_projectile(ship_x, ship_y, ship_width, ship_height, 'up', 'player'))
-
-                keys = pygame.key.get_pressed()
-                ship_x += (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * SHIP_MOVE_SPEED
-
-                if fleet and fleet_state['dx'] != 0:
-                    fleet_state['x'] += fleet_state['dx']
-                    for drone in fleet:
-                        drone['x'] = fleet_state['x'] + drone['col'] * (DRONE_WIDTH + FLEET_SPACING)
-                        drone['y'] = fleet_state['y'] + drone['row'] * (DRONE_HEIGHT + FLEET_SPACING)
-                    fleet_left_edge, current_fleet_width = calculate_fleet_bounds(fleet)
-                    if current_fleet_width > 0 and (
-                            fleet_left_edge <= SPACE or (
-                            fleet_left_edge + current_fleet_width) >= CANVAS_WIDTH - SPACE):
-                        fleet_state['dx'] *= -1
-
-                if is_level_4:
-                    battleship_was_hit, score_from_battleship = handle_level4_boss_collisions(projectiles, battleship)
-                else:
-                    battleship_was_hit, score_from_battleship = handle_battleship_collisions(projectiles, battleship)
+def create_recording(seed):
+    return {'seed': seed, 'ticks': 0, 'runs': []}
 
-                raw_score += score_from_battleship
-                raw_score += handle_fleet_collisions(projectiles, fleet)
-                update_battleship_status(battleship, fleet, battleship_was_hit, fleet_state['dx'])
-                handle_projectile_collisions(projectiles)
 
-                if handle_ship_collision(projectiles, pygame.Rect(ship_x, ship_y, ship_width, ship_height)):
-                    player_lives -= 1
-                    if player_lives < 0:
-                        game_state = "game_over"
-                    else:
-                        ship_x = (CANVAS_WIDTH - ship_width) / 2
-                        projectiles = [p for p in projectiles if p['direction'] == 'up']
-                        screen.fill(COLOR_1)
-                        draw_fleet(screen, fleet)
-                        draw_battleship(screen, battleship, is_level_4)
-                        draw_lives(screen, player_lives)
-                        draw_score(screen, fonts['score'], raw_score, total_game_points)
-                        for proj in projectiles: pygame.draw.rect(screen, SHIP_PROJECTILE_COLOR, proj['rect'])
-                        pygame.display.flip()
-                        pygame.time.wait(1500)
+def record_inputs(recording, inputs):
+    bits = encode_inputs(inputs)
+    runs = recording['runs']
+    if runs and runs[-1][0] == bits and runs[-1][1] < 0xFFFF:
+        runs[-1][1] += 1
+    else:
+        runs.append([bits, 1])
+    recording['ticks'] += 1
 
 
-                fleet_left_edge, current_fleet_width = calculate_fleet_bounds(fleet)
-                if battleship['status'] == 'passive' and current_fleet_width > 0:
-                    battleship['x'] = fleet_left_edge + (current_fleet_width / 2) - (battleship['width'] / 2)
-                else:
-                    battleship['x'] += battleship.get('dx', 0)
-
-                for proj in projectiles[:]:
-                    proj['rect'].y += -SHIP_PROJECTILE_SPEED if proj['direction'] == 'up' else DRONE_PROJECTILE_SPEED
-                    if not (0 < proj['rect'].bottom and proj['rect'].top < CANVAS_HEIGHT):
-                        projectiles.remove(proj)
-
-                ship_x = max(SPACE / 2, min(ship_x, CANVAS_WIDTH - ship_width - SPACE / 2))
-
-                alive_drones = [d for d in fleet if d['status'] == 'alive']
-                if alive_drones:
-                    bottom_drones = {col: max(d['row'] for d in alive_drones if d['col'] == col) for col in
-                                     {d['col'] for d in alive_drones}}
-                    for drone in alive_drones:
-                        if drone['row'] == bottom_drones.get(drone['col']) and random.random() < DRONE_FIRE_CHANCE:
-                            if not any(p['owner'] == (drone['row'], drone['col']) for p in projectiles):
-                                projectiles.append(
-                                    fire_projectile(drone['x'], drone['y'], DRONE_WIDTH, DRONE_HEIGHT, 'down',
-                                                    (drone['row'], drone['col'])))
-
-                if battleship['status'] == 'active' and battleship[
-                    'status'] != 'destroyed' and random.random() < BATTLESHIP_FIRE_CHANCE:
-                    projectiles.append(
-                        fire_projectile(battleship['x'], battleship['y'], battleship['width'], battleship['height'],
-                                        'down',
-                                        'battleship'))
-
-                if battleship['status'] == 'active':
-                    if battleship['x'] > CANVAS_WIDTH:
-                        battleship['x'] = -battleship['width']
-                    elif battleship['x'] + battleship['width'] < 0:
-                        battleship['x'] = CANVAS_WIDTH
-
-                all_parts_gone = not any(p['status'] == 'alive' for p in battleship.get('parts', []))
-                core_destroyed = battleship['status'] == 'destroyed'
-                boss_defeated = all_parts_gone or core_destroyed
-
-                if all(d.get('status', 'destroyed') == 'destroyed' for d in fleet) and boss_defeated:
-                    game_state = "level_complete"
-
-                # --- Drawing for "playing" state ---
-                screen.fill(COLOR_1)
-                draw_fleet(screen, fleet)
-
-                if is_level_4:
-                    # Define the offset and color for the blueprint
-                    blueprint_offset = (0, 0)
-                    # A dim, white blueprint is often effective. (R, G, B, Alpha)
-                    blueprint_color = (255, 255, 255, 40)
-
-                    # Call the function to draw the blueprint on every frame
-                    draw_static_blueprint(screen, battleship['x'], battleship['y'], level4_boss_shape,
-                                          blueprint_offset, blueprint_color)
-
-                draw_battleship(screen, battleship, is_level_4)
-                draw_ship(screen, ship_x, ship_y)
-                draw_lives(screen, player_lives)
-                draw_score(screen, fonts['score'], raw_score, total_game_points)
-                for proj in projectiles:
-                    color = SHIP_PROJECTILE_COLOR if proj['direction'] == 'up' else (
-                        BATTLESHIP_PROJECTILE_COLOR if proj['owner'] == 'battleship' else DRONE_PROJECTILE_COLOR)
-                    pygame.draw.rect(screen, color, proj['rect'])
-
-            # This call handles updating the display for all states
-            pygame.display.flip()
-            if IS_WEB_BUILD:
-                await asyncio.sleep(0)
-            else:
-                clock.tick(60)
+def recorded_inputs(recording):
+    for bits, count in recording['runs']:
+        inputs = decode_inputs(bits)
+        for _ in range(count):
+            yield inputs
+
+
+def save_recording(path, recording, state):
+    """Writes the recording, stamped with the final score and state hash the replay must reach."""
+    with open(path, 'wb') as f:
+        f.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, recording['seed'], recording['ticks'],
+                                   state['raw_score'], state_hash(state)))
+        f.write(b''.join(REPLAY_RUN.pack(bits, count) for bits, count in recording['runs']))
+
+
+def load_recording(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < REPLAY_HEADER.size:
+        raise ValueError(f"{path} is not a RADIANT recording")
+    magic, version, seed, ticks, score, digest = REPLAY_HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(f"{path} is not a version {REPLAY_VERSION} RADIANT recording")
+    runs = [list(run) for run in REPLAY_RUN.iter_unpack(data[REPLAY_HEADER.size:])]
+    return {'seed': seed, 'ticks': ticks, 'runs': runs, 'score': score, 'hash': digest}
+
+
+def replay_recording(recording):
+    """
+    Re-runs a loaded recording through step() with no display. Returns the final state and
+    whether it reached the recorded score and state hash.
+    """
+    state = create_game_state(seed=recording['seed'])
+    for inputs in recorded_inputs(recording):
+        if state['mode'] == "level_complete":
+            advance_level(state)
+        if state['mode'] != "playing":
+            break
+        step(state, inputs)
+    # The game loop goes straight to 'win' after the last level, without waiting for input
+    if state['mode'] == "level_complete" and state['level_index'] == len(LEVEL_CONFIGS) - 1:
+        advance_level(state)
+    return state, state['raw_score'] == recording['score'] and state_hash(state) == recording['hash']
+
+
+def recording_path(path, game_number):
+    """The first game is recorded to `path`, later ones to numbered siblings of it."""
+    if game_number == 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{game_number}{ext}"
+
+
+# --- Main Game ---
+def draw_playing_frame(screen, fonts, state, show_ship=True, clear=True, scale=1, layers=None, draw_hud=True):
+    """
+    Composites the playfield into screen, a framebuffer at `scale` times the canvas
+    resolution, layer by layer from the bottom: background, the fleet, static decor (the
+    level-4 blueprint), the battleship and ship, HUD and projectiles. The fleet and the HUD
+    are taken from `layers` (see create_layers), where they are only rendered again when
+    they change.
+    """
+    if layers is None:
+        layers = create_layers()
+    is_level_4 = LEVEL_CONFIGS[state['level_index']]['level_number'] == 4
+    battleship = state['battleship']
+
+    if clear:
+        screen.fill(COLOR_1)
+    # Opaque over the background, which is all there is beneath it
+    fleet_layer = update_fleet_layer(layers, screen, state, scale)
+    if fleet_layer is not None:
+        screen.blit(*fleet_layer)
+
+    if is_level_4:
+        # Define the offset and color for the blueprint
+        blueprint_offset = (0, 0)
+        # A dim, white blueprint is often effective. (R, G, B, Alpha)
+        blueprint_color = (255, 255, 255, 40)
+
+        # Call the function to draw the blueprint on every frame
+        draw_static_blueprint(screen, battleship['x'], battleship['y'], level4_boss_shape,
+                              blueprint_offset, blueprint_color, scale)
+
+    draw_battleship(screen, battleship, is_level_4, state['boss_arrays'], scale)
+    if show_ship:
+        draw_ship(screen, state['ship_x'], state['ship_y'], scale)
+    if draw_hud:
+        update_hud_layer(layers, fonts, state, scale)
+        screen.blits(layers['hud'], doreturn=False)
+    for proj in state['projectiles']:
+        color = SHIP_PROJECTILE_COLOR if proj.direction == 'up' else (
+            BATTLESHIP_PROJECTILE_COLOR if proj.owner == 'battleship' else DRONE_PROJECTILE_COLOR)
+        pygame.draw.rect(screen, color, proj.rect if scale == 1 else scale_rect(proj.rect, scale))
+
+
+# --- Layers ---
+def create_layers():
+    """
+    The playing scene's compositor state: the fleet layers (one per slot spacing, see
+    update_fleet_layer) and the HUD layer with the keys they were rendered for, and the
+    rects the last presented frame drew into (None forces a full frame).
+    """
+    return {'fleet': {}, 'fleet_key': None, 'hud': [], 'hud_key': None, 'previous': None, 'previous_hud': []}
+
+
+def _formation_offsets(origin, pitch, count, span, scale):
+    """
+    Pixel offset of each formation column (or row) from the first at `scale`, as
+    sprite_blits places a sprite up to `span` canvas pixels across there; None if the parts
+    of one would land a pixel apart somewhere.
+    """
+    extent = math.ceil(span * scale)
+    first = int(origin * scale)
+    offsets = []
+    for i in range(count):
+        position = (origin + i * pitch) * scale
+        if position < 0 or int(position + extent) - extent != int(position):
+            return None
+        offsets.append(int(position) - first)
+    return tuple(offsets)
+
+
+def _composite_fleet(screen, blits):
+    """The drone blits (see sprite_blits) over the background on one surface in screen's format, and its position."""
+    bounds = [pygame.Rect(dest, (area or sprite.get_rect()).size) for sprite, dest, area in blits]
+    bounds = bounds[0].unionall(bounds[1:])
+    surface = pygame.Surface(bounds.size, 0, screen)
+    surface.fill(COLOR_1)
+    surface.blits([(sprite, (x - bounds.x, y - bounds.y), area) for sprite, (x, y), area in blits], doreturn=False)
+    return surface, bounds.topleft
+
+
+def update_fleet_layer(layers, screen, state, scale=1):
+    """
+    The fleet layer, every alive drone composited over the background at its formation
+    slot on one surface in screen's format, and where to blit it this frame; None once
+    the fleet is gone. The formation moves as one rigid grid, so the layer is rendered
+    again only when a part is destroyed. Where the formation pitch isn't a whole number
+    of pixels the slots land a pixel apart differently as it moves; each of those few
+    spacings gets its own layer.
+    """
+    fleet, fleet_state = state['fleet'], state['fleet_state']
+    slots = fleet_slots(fleet, fleet_state)
+    if not slots:
+        return None
+    alive = (drone for drone in fleet if drone['status'] == 'alive' and drone['parts'])
+    fleet_x, fleet_y = fleet_state['x'], fleet_state['y']
+    col_offsets = _formation_offsets(fleet_x, FLEET_PITCH_X, len(slots[0]), DRONE_WIDTH, scale)
+    row_offsets = _formation_offsets(fleet_y, FLEET_PITCH_Y, len(slots), DRONE_HEIGHT, scale)
+    if col_offsets is None or row_offsets is None:
+        # A drone's parts round apart at this position; a layer for it is only good for this frame
+        blits = [blit for drone in alive for blit in sprite_blits(
+            get_entity_sprite(drone['parts'], scale=scale), (fleet_x + drone['col'] * FLEET_PITCH_X) * scale,
+            (fleet_y + drone['row'] * FLEET_PITCH_Y) * scale)]
+        return _composite_fleet(screen, blits) if blits else None
+
+    # The fleet is compared by identity; a new level brings a new one
+    cached_key = layers['fleet_key']
+    if cached_key is None or cached_key[0] is not fleet or cached_key[1:] != (fleet_state['hits'], scale):
+        layers['fleet'], layers['fleet_key'] = {}, (fleet, fleet_state['hits'], scale)
+    spacing = (col_offsets, row_offsets)
+    if spacing not in layers['fleet']:
+        blits = []
+        for drone in alive:
+            sprite, (origin_x, origin_y), _ = get_entity_sprite(drone['parts'], scale=scale)
+            blits.append((sprite, (col_offsets[drone['col']] + origin_x, row_offsets[drone['row']] + origin_y), None))
+        layers['fleet'][spacing] = _composite_fleet(screen, blits) if blits else None
+    layer = layers['fleet'][spacing]
+    if layer is None:
+        return None
+    surface, (left, top) = layer
+    return surface, (int(fleet_x * scale) + left, int(fleet_y * scale) + top)
+
+
+def update_hud_layer(layers, fonts, state, scale=1):
+    """
+    Renders the HUD layer, the lives row and the score label as (surface, rect) pairs,
+    again if a life was lost or the displayed score changed. Returns True if it did.
+    """
+    key = (state['lives'], display_score_text(state['raw_score'], state['total_game_points']), scale)
+    if key == layers['hud_key']:
+        return False
+    hud = []
+    lives_layer = render_lives(state['lives'], scale)
+    if lives_layer:
+        hud.append(lives_layer)
+    hud.append(_score_label(fonts['score'], state['raw_score'], state['total_game_points'], scale))
+    layers['hud'], layers['hud_key'] = hud, key
+    return True
+
+
+def _fleet_rect(fleet, fleet_arrays=None):
+    if fleet_arrays is not None:
+        alive = fleet_arrays['alive']
+        if not alive.any(): return None
+        xs, ys = fleet_arrays['x'][alive], fleet_arrays['y'][alive]
+        left, top, right, bottom = float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+    else:
+        alive_drones = [d for d in fleet if d['status'] == 'alive']
+        if not alive_drones: return None
+        left, right = min(d['x'] for d in alive_drones), max(d['x'] for d in alive_drones)
+        top, bottom = min(d['y'] for d in alive_drones), max(d['y'] for d in alive_drones)
+    return pygame.Rect(left, top, right - left + DRONE_WIDTH + 1, bottom - top + DRONE_HEIGHT + 1)
+
+
+def playing_frame_rects(state, scale=1):
+    """
+    Framebuffer regions the decor, entity and projectile layers paint into for this
+    state at `scale`, clipped to it. The HUD layer keeps its own rects.
+    """
+    battleship = state['battleship']
+    is_level_4 = LEVEL_CONFIGS[state['level_index']]['level_number'] == 4
+    rects = [pygame.Rect(state['ship_x'], state['ship_y'], SHIP_WIDTH, SHIP_HEIGHT)]
+
+    fleet_rect = _fleet_rect(state['fleet'], state['fleet_arrays'])
+    if fleet_rect:
+        rects.append(fleet_rect)
+    # The level-4 blueprint is drawn even after the boss itself is gone
+    if battleship.get('parts') and (is_level_4 or battleship['status'] != 'destroyed'):
+        rects.append(pygame.Rect(battleship['x'], battleship['y'], battleship['width'] + 1, battleship['height'] + 1))
+    rects.extend(proj.rect for proj in state['projectiles'])
+    if scale != 1:
+        rects = [scale_rect(rect, scale) for rect in rects]
+
+    # The framebuffer's size, which rounds a partly covered last row up (see FrameScheduler.framebuffer)
+    canvas = pygame.Rect(0, 0, math.ceil(CANVAS_WIDTH * scale), math.ceil(CANVAS_HEIGHT * scale))
+    return [clipped for clipped in (rect.clip(canvas) for rect in rects) if clipped.width and clipped.height]
+
+
+def draw_playing_frame_dirty(screen, fonts, state, layers, scale=1):
+    """
+    Dirty-rect version of draw_playing_frame. Erasing everything the moving layers drew
+    last frame leaves plain background, so compositing them again on top gives the same
+    image as a full frame while only those regions are filled and presented. The HUD is
+    left alone unless it changed or something moving touches it. Returns the rects to update.
+    """
+    hud_changed = update_hud_layer(layers, fonts, state, scale)
+    rects = playing_frame_rects(state, scale)
+    hud_rects = [rect for _, rect in layers['hud']]
+    previous, previous_hud = layers['previous'], layers['previous_hud']
+    layers['previous'], layers['previous_hud'] = rects, hud_rects
+    if previous is None:
+        draw_playing_frame(screen, fonts, state, scale=scale, layers=layers)
+        return [screen.get_rect()]
+
+    # Blitting the translucent HUD over itself would build up its edges, so it is
+    # erased and composited again whenever it has to be repainted
+    repaint_hud = hud_changed or any(rect.collidelist(hud_rects) != -1 for rect in previous + rects)
+    erased = previous + previous_hud + hud_rects if repaint_hud else previous
+    for rect in erased:
+        screen.fill(COLOR_1, rect)
+    draw_playing_frame(screen, fonts, state, clear=False, scale=scale, layers=layers, draw_hud=repaint_hud)
+    return erased + rects
+
+
+class PlayingScene(Scene):
+    """Plays the current level one step() per tick until it is won or lost."""
+    tick_rate = TICK_RATE
+    render_divisor = RENDER_DIVISOR
+
+    def __init__(self, fonts, state, recording=None):
+        super().__init__()
+        self.fonts = fonts
+        self.state = state
+        self.recording = recording
+        self.scale = 1 / self.render_divisor
+        self.layers = create_layers()
+        self.fire_pressed = False
+        # After a life is lost the board freezes, without the ship, for a moment
+        self.freeze_ticks = 0
+        self.frozen_frame_presented = False
+
+    def handle_event(self, event):
+        # Using K_UP as per original code
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_UP:
+            self.fire_pressed = True
+
+    def invalidate(self):
+        self.layers['previous'] = None
+        self.frozen_frame_presented = False
+
+    def profile_counts(self):
+        state = self.state
+        return {
+            'drones': state['fleet_state']['alive_drones'],
+            'boss parts': sum(1 for p in state['battleship'].get('parts', []) if p['status'] == 'alive'),
+            'projectiles': len(state['projectiles']),
+        }
+
+    def update(self):
+        if self.freeze_ticks:
+            self.freeze_ticks -= 1
+            return
+
+        keys = pygame.key.get_pressed()
+        inputs = {'left': bool(keys[pygame.K_LEFT]), 'right': bool(keys[pygame.K_RIGHT]), 'fire': self.fire_pressed}
+        self.fire_pressed = False
+        if self.recording is not None:
+            record_inputs(self.recording, inputs)
+
+        if 'life_lost' in step(self.state, inputs):
+            self.freeze_ticks = int(1.5 * TICK_RATE)
+        self.done = self.state['mode'] != "playing"
+
+    def draw(self, screen):
+        if self.freeze_ticks:
+            if self.frozen_frame_presented:
+                return []
+            draw_playing_frame(screen, self.fonts, self.state, show_ship=False, scale=self.scale, layers=self.layers)
+            self.layers['previous'] = None
+            self.frozen_frame_presented = True
+            return None
+        self.frozen_frame_presented = False
+
+        if DIRTY_RECT_RENDERING:
+            return draw_playing_frame_dirty(screen, self.fonts, self.state, self.layers, self.scale)
+        draw_playing_frame(screen, self.fonts, self.state, scale=self.scale, layers=self.layers)
+        return None
+
+
+async def main(record_path=None, seed=None):
+    startup = StartupTimer()
+    startup.mark('imports')
+    # Only what the game uses; no audio, joystick or other subsystems
+    pygame.display.init()
+    pygame.font.init()
+    window = pygame.display.set_mode(WINDOW_SIZE, pygame.RESIZABLE)
+    pygame.display.set_caption("RADIANT")
+    startup.mark('display')
+    scheduler = FrameScheduler(window, startup=startup)
+    # Reads the boot assets; the deferred bundle streams in behind the cover and intro
+    start_asset_bundle()
+    startup.mark('assets')
+    fonts = load_fonts()
+    startup.mark('fonts')
+
+    # The cover comes in the deferred bundle, so that goes first. The rest is needed once the
+    # first game starts, so it is done while the cover is up
+    scheduler.defer('asset bundle', fetch_deferred_assets)
+    if USE_ARRAY_FLEET or USE_ARRAY_BOSS:
+        scheduler.defer('numpy', load_numpy)
+    scheduler.defer('level pack', load_level_pack)
+
+    # Show the cover (decoded behind a placeholder) until it times out or a key is pressed
+    await scheduler.run(CoverScene(fonts, load_cover_image(), 5))
+
+    await scheduler.run(ScrollingTextScene(fonts, STORY_TEXTS['intro'].splitlines()))
+    total_game_points = compute_total_game_points()
+
+    game_number = 0
+    while True:
+        game_number += 1
+        state = create_game_state(total_game_points, seed)
+        recording = create_recording(state['seed']) if record_path else None
+        try:
+            await scheduler.run(DeploymentScene(state))
+            while True:
+                await scheduler.run(PlayingScene(fonts, state, recording))
+
+                # --- State Machine Logic ---
+                if state['mode'] == "level_complete":
+                    # Check if the level we just finished is the last one in our list
+                    if state['level_index'] == len(LEVEL_CONFIGS) - 1:
+                        # If it's the last level, go directly to the win screen
+                        state['mode'] = "win"
+
+                    else:
+                        # Otherwise, for any other level, show the complete screen
+                        await scheduler.run(LevelCompleteScene(fonts, state['level_index'] + 1, state['lives'],
+                                                               state['raw_score'], total_game_points))
+                        # Set up the next level to play
+                        advance_level(state)
+                        await scheduler.run(DeploymentScene(state))
+                        continue
+
+                # 'win' or 'game_over'
+                if await scheduler.run(OutroScene(fonts, state['mode'], state['raw_score'], total_game_points)):
+                    break  # Break from inner loop to restart game
+                pygame.quit()  # Quit entirely
+                sys.exit()
+        finally:
+            # Also reached when the player quits mid-game or from the outro screen
+            if recording is not None:
+                save_recording(recording_path(record_path, game_number), recording, state)
+
+
+def parse_args(argv=None):
+    import argparse
+
+    def game_count(text):
+        count = int(text)
+        if count < 0:
+            raise argparse.ArgumentTypeError(f"expected a count of 0 or more, got {count}")
+        return count
+
+    def seed(text):
+        value = int(text)
+        if not SEED_RANGE[0] <= value <= SEED_RANGE[1]:
+            raise argparse.ArgumentTypeError(f"seeds must fit in a signed 64-bit integer, got {value}")
+        return value
+
+    parser = argparse.ArgumentParser(description="RADIANT")
+    parser.add_argument('--headless', type=game_count, metavar='GAMES', nargs='?', const=1,
+                        help="simulate GAMES full games with the autopilot and no display, then exit")
+    parser.add_argument('--seed', type=seed, help="seed the game's RNG instead of picking a random seed")
+    parser.add_argument('--record', metavar='FILE', help="record each game's seed and inputs to FILE")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="re-run a recording with no display and check it reaches the recorded state, then exit")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="print how long each startup phase took, up to the first frame")
+    args, _ = parser.parse_known_args(argv)
+    return args
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    args = parse_args()
+    if args.replay:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        recording = load_recording(args.replay)
+        final_state, matches = replay_recording(recording)
+        print(f"replay {args.replay}: {final_state['mode']} on level {final_state['level_index'] + 1}, "
+              f"score {final_state['raw_score']} (recorded {recording['score']}), {final_state['tick']} ticks, "
+              f"{'state matches' if matches else 'STATE MISMATCH'}")
+        sys.exit(0 if matches else 1)
+    elif args.headless is not None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        for game in range(args.headless):
+            final_state = run_headless(seed=None if args.seed is None else args.seed + game)
+            print(f"game {game + 1}: {final_state['mode']} on level {final_state['level_index'] + 1}, "
+                  f"score {final_state['raw_score']}/{final_state['total_game_points']}, "
+                  f"{final_state['tick']} ticks")
+    else:
+        if args.startup_report:
+            STARTUP_REPORT = True
+        asyncio.run(main(args.record, args.seed))
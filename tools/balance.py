@@ -0,0 +1,198 @@
+"""
+Headless balance runs for RADIANT.
+
+Plays N games per level with the scripted autopilot for every combination of the
+swept parameters, spread over all CPU cores, and aggregates win rate, time to
+clear and score per level into JSON and/or CSV:
+
+    python tools/balance.py --games 200 --output balance.json --csv balance.csv
+    python tools/balance.py --drone-fire-chance 0.001 0.002 0.004 --fleet-speed-scale 1 1.25 1.5
+
+Each game starts on its level with full lives and ends when the level is cleared,
+the ship runs out of lives or the time limit runs out. Game seeds are the same for
+every parameter set, so the sets are compared on identical games.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as game  # noqa: E402
+
+BASE_LEVEL_CONFIGS = game.LEVEL_CONFIGS
+# Swept parameters and their defaults, the values the game ships with
+SWEEPS = {
+    'drone_fire_chance': [game.DRONE_FIRE_CHANCE],
+    'fleet_speed_scale': [1.0],
+    'battleship_speed_multiplier': [game.BATTLESHIP_ACTIVE_SPEED_MULTIPLIER],
+}
+CSV_FIELDS = ['drone_fire_chance', 'fleet_speed_scale', 'battleship_speed_multiplier', 'level', 'games', 'wins',
+              'win_rate', 'timeouts', 'clear_seconds_mean', 'clear_seconds_p50', 'clear_seconds_p90',
+              'score_mean', 'score_min', 'score_p10', 'score_p50', 'score_p90', 'score_max', 'lives_lost_mean']
+
+_scaled_configs = {}
+
+
+# --- Simulation (runs in the worker processes) ---
+def apply_params(params):
+    """Points the game module at one parameter set. Scaled level configs are compiled in memory, never on disk."""
+    game.LEVEL_PACK_PATH = None
+    game.DRONE_FIRE_CHANCE = params['drone_fire_chance']
+    game.BATTLESHIP_ACTIVE_SPEED_MULTIPLIER = params['battleship_speed_multiplier']
+
+    scale = params['fleet_speed_scale']
+    configs = _scaled_configs.get(scale)
+    if configs is None:
+        configs = _scaled_configs[scale] = [
+            dict(config, fleet_move_speed=config.get('fleet_move_speed', game.FLEET_MOVE_SPEED) * scale)
+            for config in BASE_LEVEL_CONFIGS]
+    game.LEVEL_CONFIGS = configs
+
+
+def play_level(level_idx, seed, max_ticks):
+    """One autopilot game on a single level. Returns (outcome, ticks, score, lives lost)."""
+    state = game.create_game_state(total_game_points=1, seed=seed)
+    if level_idx:
+        game.start_level(state, level_idx)
+    while state['mode'] == 'playing' and state['tick'] < max_ticks:
+        game.step(state, game.autopilot(state))
+
+    outcome = {'level_complete': 'win', 'game_over': 'loss'}.get(state['mode'], 'timeout')
+    return outcome, state['tick'], state['raw_score'], game.PLAYER_LIVES - max(state['lives'], 0)
+
+
+def run_batch(params, level_idx, seeds, max_ticks):
+    apply_params(params)
+    return [play_level(level_idx, seed, max_ticks) for seed in seeds]
+
+
+# --- Aggregation ---
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = fraction * (len(sorted_values) - 1)
+    lower = int(index)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (index - lower)
+
+
+def mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def summarize(params, level_idx, games):
+    clear_seconds = sorted(ticks / game.TICK_RATE for outcome, ticks, _, _ in games if outcome == 'win')
+    scores = sorted(score for _, _, score, _ in games)
+    wins = sum(1 for outcome, _, _, _ in games if outcome == 'win')
+    return dict(
+        params,
+        level=BASE_LEVEL_CONFIGS[level_idx]['level_number'],
+        games=len(games),
+        wins=wins,
+        win_rate=wins / len(games),
+        timeouts=sum(1 for outcome, _, _, _ in games if outcome == 'timeout'),
+        clear_seconds_mean=mean(clear_seconds),
+        clear_seconds_p50=percentile(clear_seconds, 0.5),
+        clear_seconds_p90=percentile(clear_seconds, 0.9),
+        score_mean=mean(scores),
+        score_min=scores[0],
+        score_p10=percentile(scores, 0.1),
+        score_p50=percentile(scores, 0.5),
+        score_p90=percentile(scores, 0.9),
+        score_max=scores[-1],
+        lives_lost_mean=mean([lives_lost for _, _, _, lives_lost in games]),
+    )
+
+
+def parameter_sets(sweeps):
+    names = list(sweeps)
+    return [dict(zip(names, values)) for values in itertools.product(*(sweeps[name] for name in names))]
+
+
+def run(sweeps, levels, num_games, seed, max_ticks, workers, batch_size):
+    param_sets = parameter_sets(sweeps)
+    seeds = [seed + i for i in range(num_games)]
+    batches = [(set_index, level_idx, seeds[start:start + batch_size])
+               for set_index in range(len(param_sets)) for level_idx in levels
+               for start in range(0, num_games, batch_size)]
+
+    games = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_batch, param_sets[set_index], level_idx, batch_seeds, max_ticks):
+                   (set_index, level_idx) for set_index, level_idx, batch_seeds in batches}
+        for done, future in enumerate(as_completed(futures), 1):
+            games.setdefault(futures[future], []).extend(future.result())
+            print(f"\r{done}/{len(batches)} batches, {time.perf_counter() - started:.1f} s", end='', file=sys.stderr)
+    print(file=sys.stderr)
+
+    results = [summarize(param_sets[set_index], level_idx, games[set_index, level_idx])
+               for set_index in range(len(param_sets)) for level_idx in levels]
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'games_per_level': num_games,
+            'seed': seed,
+            'max_seconds': max_ticks / game.TICK_RATE,
+            'workers': workers,
+            'wall_seconds': time.perf_counter() - started,
+        },
+        'results': results,
+    }
+
+
+def write_csv(path, results):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless autopilot games to tune RADIANT's balance.")
+    parser.add_argument('--games', type=int, default=100, help="games per level and parameter set")
+    parser.add_argument('--levels', type=int, nargs='+', choices=[c['level_number'] for c in BASE_LEVEL_CONFIGS],
+                        help="level numbers to play (default: all)")
+    parser.add_argument('--drone-fire-chance', type=float, nargs='+', default=SWEEPS['drone_fire_chance'])
+    parser.add_argument('--fleet-speed-scale', type=float, nargs='+', default=SWEEPS['fleet_speed_scale'],
+                        help="multiplies every level's fleet_move_speed")
+    parser.add_argument('--battleship-speed-multiplier', type=float, nargs='+',
+                        default=SWEEPS['battleship_speed_multiplier'])
+    parser.add_argument('--max-seconds', type=float, default=600, help="game time limit per level")
+    parser.add_argument('--seed', type=int, default=1234, help="seed of the first game; game i uses seed + i")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--batch-size', type=int, default=10, help="games per task sent to a worker")
+    parser.add_argument('--output', help="write the JSON results here instead of stdout")
+    parser.add_argument('--csv', help="also write the aggregated rows as CSV")
+    args = parser.parse_args(argv)
+
+    level_numbers = [c['level_number'] for c in BASE_LEVEL_CONFIGS]
+    levels = [level_numbers.index(number) for number in args.levels] if args.levels else range(len(level_numbers))
+    sweeps = {
+        'drone_fire_chance': args.drone_fire_chance,
+        'fleet_speed_scale': args.fleet_speed_scale,
+        'battleship_speed_multiplier': args.battleship_speed_multiplier,
+    }
+    report = run(sweeps, list(levels), args.games, args.seed, int(args.max_seconds * game.TICK_RATE),
+                 args.workers, args.batch_size)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    if args.csv:
+        write_csv(args.csv, report['results'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Benchmarks for the per-frame hot paths of RADIANT.
+
+Builds LEVEL_CONFIGS-style levels at scale (10 / 100 / 1000 drones, large
+collapsing bosses, hundreds of projectiles), times the collision handlers,
+draw_fleet and a full playing-state tick, and writes the results as JSON with
+percentiles so runs can be compared before each pygbag build:
+
+    python tools/benchmark.py --output bench.json
+    python tools/benchmark.py --compare bench.json --threshold 1.25
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+import main as game  # noqa: E402
+
+DRONE_COUNTS = [10, 100, 1000]
+BOSS_ROWS = [5, 20, 60, 200]
+PROJECTILE_COUNTS = [1, 10, 100, 300]  # 1: the player only ever has one shot in flight
+FLEET_COLUMNS = 40
+
+
+# --- Synthetic Levels ---
+def make_fleet_config(num_drones, shape_keys=('one', 'two', 'three')):
+    """A 'fleet_layout' level with num_drones drones, FLEET_COLUMNS per row, cycling through the drone shapes."""
+    layout = {}
+    for i in range(num_drones):
+        row, col = divmod(i, FLEET_COLUMNS)
+        layout.setdefault(row + 1, []).append(shape_keys[(row + col) % len(shape_keys)])
+    return {
+        'level_number': 1,
+        'num_rows': len(layout),
+        'fleet_move_speed': game.FLEET_MOVE_SPEED,
+        'fleet_layout': layout,
+        'battleship_shape_offsets': [],
+    }
+
+
+def make_boss_shape(body_rows):
+    """A level4_boss_shape-style boss: the original head and core on top of body_rows full rows of 15 cells."""
+    head = [offset for offset in game.level4_boss_shape if offset[1] < 5]
+    body = [(x, y) for y in range(5, 5 + body_rows) for x in range(15)]
+    return head + body
+
+
+def make_boss_config(body_rows):
+    return {
+        'level_number': 4,
+        'num_rows': 0,
+        'fleet_move_speed': game.FLEET_MOVE_SPEED,
+        'battleship_shape_offsets': make_boss_shape(body_rows),
+        'battleship_core_offset': (7, 1),
+    }
+
+
+def place_fleet(fleet):
+    fleet_state = {'x': game.SPACE, 'y': 2 * game.SIZE, 'dx': -game.FLEET_MOVE_SPEED, 'hits': 0}
+    game.update_fleet_positions(fleet, fleet_state)
+    game.count_alive_drones(fleet, fleet_state)
+    game.fleet_slots(fleet, fleet_state)  # once per level in the game as well
+    return fleet_state
+
+
+def make_projectiles(rng, count, area, up_share=0.5):
+    """
+    Specs (x, y, direction, owner) for projectiles spread over area (x, y, width, height);
+    up_share of them are player shots. load_projectiles turns them into a pool.
+    """
+    x, y, width, height = area
+    specs = []
+    for i in range(count):
+        direction = 'up' if i < count * up_share else 'down'
+        owner = 'player' if direction == 'up' else (i, i)
+        specs.append((rng.uniform(x, x + width), rng.uniform(y, y + height), direction, owner))
+    rng.shuffle(specs)
+    return specs
+
+
+def fleet_area(fleet):
+    left = min(d['x'] for d in fleet)
+    top = min(d['y'] for d in fleet)
+    right = max(d['x'] + game.DRONE_WIDTH for d in fleet)
+    bottom = max(d['y'] + game.DRONE_HEIGHT for d in fleet)
+    return left, top, right - left, bottom - top
+
+
+def load_projectiles(specs, projectiles=None):
+    projectiles = game.ProjectilePool() if projectiles is None else projectiles
+    for x, y, direction, owner in specs:
+        game.fire_projectile(projectiles, x, y, 0, 0, direction, owner)
+    return projectiles
+
+
+# --- Timing ---
+def percentile(sorted_samples, fraction):
+    if not sorted_samples:
+        return 0.0
+    index = fraction * (len(sorted_samples) - 1)
+    lower = int(index)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (index - lower)
+
+
+def summarize(name, params, samples_ns):
+    samples_us = sorted(ns / 1000 for ns in samples_ns)
+    return {
+        'name': name,
+        'params': params,
+        'unit': 'us',
+        'samples': len(samples_us),
+        'mean': sum(samples_us) / len(samples_us),
+        'min': samples_us[0],
+        'p50': percentile(samples_us, 0.50),
+        'p90': percentile(samples_us, 0.90),
+        'p95': percentile(samples_us, 0.95),
+        'p99': percentile(samples_us, 0.99),
+        'max': samples_us[-1],
+    }
+
+
+def time_calls(repeat, setup, call):
+    """Times call(*setup()) repeat times; setup runs outside the timed region."""
+    samples = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter_ns()
+        call(*args)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def storages():
+    return ['dicts', 'arrays'] if game.HAS_NUMPY else ['dicts']
+
+
+# --- Benchmarks ---
+def bench_fleet_collisions(rng, repeat):
+    for num_drones in DRONE_COUNTS:
+        fleet = game.create_fleet(make_fleet_config(num_drones))
+        fleet_state = place_fleet(fleet)
+        for num_projectiles in PROJECTILE_COUNTS:
+            projectiles = make_projectiles(rng, num_projectiles, fleet_area(fleet), up_share=1.0)
+            for storage in storages():
+                def setup():
+                    fleet_copy = copy.deepcopy(fleet)
+                    arrays = None
+                    if storage == 'arrays':
+                        arrays = game.create_fleet_arrays(fleet_copy)
+                        game.update_fleet_positions(fleet_copy, fleet_state, arrays)
+                    return load_projectiles(projectiles), fleet_copy, dict(fleet_state), arrays
+
+                samples = time_calls(repeat, setup, game.handle_fleet_collisions)
+                yield summarize('handle_fleet_collisions',
+                                {'drones': num_drones, 'projectiles': num_projectiles, 'storage': storage}, samples)
+
+
+def bench_boss_collisions(rng, repeat):
+    for body_rows in BOSS_ROWS:
+        battleship = game.create_battleship(make_boss_config(body_rows))
+        battleship['x'], battleship['y'] = game.SPACE, game.SIZE
+        area = (battleship['x'], battleship['y'], battleship['width'], battleship['height'])
+        for num_projectiles in PROJECTILE_COUNTS:
+            projectiles = make_projectiles(rng, num_projectiles, area, up_share=1.0)
+            for storage in storages():
+                def setup():
+                    battleship_copy = copy.deepcopy(battleship)
+                    if storage == 'arrays':
+                        return (load_projectiles(projectiles), battleship_copy,
+                                game.create_boss_arrays(battleship_copy))
+                    return load_projectiles(projectiles), battleship_copy
+
+                call = game.handle_level4_boss_collisions_arrays if storage == 'arrays' \
+                    else game.handle_level4_boss_collisions
+                samples = time_calls(repeat, setup, call)
+                yield summarize('handle_level4_boss_collisions',
+                                {'boss_parts': len(battleship['parts']), 'projectiles': num_projectiles,
+                                 'storage': storage}, samples)
+
+
+def bench_projectile_collisions(rng, repeat):
+    area = (0, 0, game.CANVAS_WIDTH, game.CANVAS_HEIGHT)
+    for num_projectiles in PROJECTILE_COUNTS:
+        projectiles = make_projectiles(rng, num_projectiles, area)
+        samples = time_calls(repeat, lambda: (load_projectiles(projectiles),), game.handle_projectile_collisions)
+        yield summarize('handle_projectile_collisions', {'projectiles': num_projectiles}, samples)
+
+
+def bench_draw_fleet(rng, repeat):
+    screen = pygame.Surface((game.CANVAS_WIDTH, game.CANVAS_HEIGHT))
+    for num_drones in DRONE_COUNTS:
+        fleet = game.create_fleet(make_fleet_config(num_drones))
+        fleet_state = place_fleet(fleet)
+        # A battle-worn fleet: about a third of the parts shot off
+        for drone in fleet:
+            for part in drone['parts']:
+                if part['wing'] != 'core' and rng.random() < 0.3:
+                    part['status'] = 'destroyed'
+        for storage in storages():
+            arrays = None
+            if storage == 'arrays':
+                arrays = game.create_fleet_arrays(fleet)
+                game.update_fleet_positions(fleet, fleet_state, arrays)
+            game.draw_fleet(screen, fleet, arrays)  # warm the sprite cache
+            samples = time_calls(repeat, lambda: (screen, fleet, arrays), game.draw_fleet)
+            yield summarize('draw_fleet', {'drones': num_drones, 'storage': storage}, samples)
+
+
+def bench_playing_tick(rng, repeat):
+    """Full step() plus drawing of a playing frame, on scaled fleets and on a large boss."""
+    screen = pygame.Surface((game.CANVAS_WIDTH, game.CANVAS_HEIGHT))
+    fonts = {'score': pygame.font.Font(None, 20)}
+    scenarios = [({'drones': n}, make_fleet_config(n)) for n in DRONE_COUNTS]
+    scenarios += [({'boss_parts': len(make_boss_shape(rows))}, make_boss_config(rows)) for rows in BOSS_ROWS]
+
+    # The synthetic levels are compiled in memory so they don't replace the game's level pack
+    original_configs, original_pack_path = game.LEVEL_CONFIGS, game.LEVEL_PACK_PATH
+    game.LEVEL_PACK_PATH = None
+    try:
+        for params, config in scenarios:
+            game.LEVEL_CONFIGS = [config]
+            for storage in storages():
+                game_use_arrays = game.USE_ARRAY_FLEET, game.USE_ARRAY_BOSS, game.ARRAY_FLEET_MIN_DRONES
+                game.USE_ARRAY_FLEET = game.USE_ARRAY_BOSS = storage == 'arrays'
+                game.ARRAY_FLEET_MIN_DRONES = 0  # time both storages at every size
+                try:
+                    state = game.create_game_state(total_game_points=1, seed=rng.randrange(2 ** 32))
+                    layers = game.create_layers()
+                    load_projectiles(make_projectiles(rng, 100, (0, 0, game.CANVAS_WIDTH, game.CANVAS_HEIGHT),
+                                                      up_share=0), state['projectiles'])
+
+                    def setup():
+                        # Keep the pilot alive so every sample is a regular playing tick
+                        state['lives'] = game.PLAYER_LIVES
+                        state['mode'] = 'playing'
+                        return ()
+
+                    def tick():
+                        game.step(state, game.autopilot(state))
+                        game.draw_playing_frame(screen, fonts, state, layers=layers)
+
+                    samples = time_calls(repeat, setup, tick)
+                finally:
+                    game.USE_ARRAY_FLEET, game.USE_ARRAY_BOSS, game.ARRAY_FLEET_MIN_DRONES = game_use_arrays
+                yield summarize('playing_tick', dict(params, storage=storage), samples)
+    finally:
+        game.LEVEL_CONFIGS, game.LEVEL_PACK_PATH = original_configs, original_pack_path
+
+
+BENCHMARKS = {
+    'handle_fleet_collisions': bench_fleet_collisions,
+    'handle_level4_boss_collisions': bench_boss_collisions,
+    'handle_projectile_collisions': bench_projectile_collisions,
+    'draw_fleet': bench_draw_fleet,
+    'playing_tick': bench_playing_tick,
+}
+
+
+# --- Comparison ---
+def result_key(result):
+    return result['name'], json.dumps(result['params'], sort_keys=True)
+
+
+def compare(baseline, current, threshold, stat='p50'):
+    """Prints current/baseline ratios per benchmark and returns the results slower than threshold."""
+    previous = {result_key(r): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get(result_key(result))
+        if not old or not old[stat]:
+            continue
+        ratio = result[stat] / old[stat]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{result['name']:<32} {json.dumps(result['params'], sort_keys=True):<60} "
+              f"{old[stat]:>10.1f} -> {result[stat]:>10.1f} us  x{ratio:.2f}{flag}", file=sys.stderr)
+        if ratio > threshold:
+            regressions.append(result)
+    return regressions
+
+
+def run(names, repeat, seed):
+    pygame.font.init()
+    rng = random.Random(seed)
+    results = []
+    for name in names:
+        for result in BENCHMARKS[name](rng, repeat):
+            print(f"{result['name']:<32} {json.dumps(result['params'], sort_keys=True):<60} "
+                  f"p50 {result['p50']:>10.1f} us  p95 {result['p95']:>10.1f} us", file=sys.stderr)
+            results.append(result)
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': sys.platform,
+            'machine': platform.machine(),
+            'pygame': pygame.version.ver,
+            'numpy': game.load_numpy().__version__ if game.HAS_NUMPY else None,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark RADIANT's per-frame hot paths.")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help="benchmarks to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=30, help="samples per benchmark case")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--quick', action='store_true', help="skip the largest level sizes")
+    parser.add_argument('--output', help="write the JSON results here instead of stdout")
+    parser.add_argument('--compare', metavar='BASELINE_JSON', help="compare p50 timings against an earlier run")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="with --compare, exit non-zero if any p50 is this many times slower")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        for sizes in (DRONE_COUNTS, BOSS_ROWS, PROJECTILE_COUNTS):
+            del sizes[-1]
+
+    report = run(args.only, args.repeat, args.seed)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than x{args.threshold}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
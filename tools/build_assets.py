@@ -0,0 +1,181 @@
+"""
+Pre-builds the RADIANT assets that are too slow to prepare at startup.
+
+The cover image is scaled to the canvas here, once, and saved as cover_image.rgbz
+(see load_image_asset in main.py), which the game inflates a chunk per frame behind
+a placeholder. Every FONT_CONFIG entry is baked into font_atlas.png plus the glyph
+metrics in font_atlas.json (see BitmapFont). These live in ignore/, which pygbag leaves
+out of the app archive. Then the runtime assets are packed into a small boot bundle and
+a deferred one, content-hashed, plus their manifest in static/ (see start_asset_bundle),
+which pygbag copies to the web root, next to loose copies of every asset for the
+fallback and the TTFs for the rare glyph the atlas lacks. Run it whenever
+cover_image.png, the canvas size, the fonts or the game's texts change, before the
+pygbag build:
+
+    python tools/build_assets.py
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+import zlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame  # noqa: E402
+import main as game  # noqa: E402
+
+
+def source_path(name):
+    """Where the repo keeps a runtime asset, out of pygbag's app archive."""
+    return os.path.join(ROOT, game.ASSET_SOURCE_DIR, name)
+
+
+def build_cover(source, target):
+    image = pygame.image.load(source)
+    # The same scaling the game did at startup, so the cover looks exactly as before
+    scaled = pygame.transform.scale(image.convert(), (game.CANVAS_WIDTH, game.CANVAS_HEIGHT))
+    game.save_image_asset(target, scaled)
+    print(f"{target}: {game.CANVAS_WIDTH}x{game.CANVAS_HEIGHT}, {os.path.getsize(target)} bytes "
+          f"(from {os.path.getsize(source)} bytes)", file=sys.stderr)
+
+
+def bake_font(font, charset):
+    """
+    White antialiased glyphs for charset, cropped to their ink, as {char: (image, offset,
+    advance)}, and the metrics BitmapFont lays strings out with.
+    """
+    glyphs = {}
+    for char in charset:
+        rendered = font.render(char, True, (255, 255, 255))
+        ink = rendered.get_bounding_rect()
+        glyphs[char] = (rendered.subsurface(ink).copy(), ink.topleft, rendered.get_width())
+    widths = {char: advance for char, (_, _, advance) in glyphs.items()}
+    # Where a pair sits closer or further apart than the two glyphs' own widths
+    kerning = {}
+    for first in charset:
+        for second in charset:
+            delta = font.size(first + second)[0] - widths[first] - widths[second]
+            if delta:
+                kerning[first + second] = delta
+    metrics = {
+        'height': font.get_height(),
+        'linesize': font.get_linesize(),
+        'ascent': font.get_ascent(),
+        'descent': font.get_descent(),
+        'kerning': kerning,
+    }
+    return glyphs, metrics
+
+
+def pack_shelves(sizes, max_width):
+    """Top-left corners for rects of the given sizes, packed in rows; returns them with the total height."""
+    positions, x, y, shelf_height = [], 0, 0, 0
+    for width, height in sizes:
+        if x + width > max_width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        positions.append((x, y))
+        x += width
+        shelf_height = max(shelf_height, height)
+    return positions, y + shelf_height
+
+
+def build_fonts(atlas_target, metrics_target, atlas_width=1024):
+    baked = {}
+    for key, (font_path, font_size, _) in game.FONT_CONFIG.items():
+        charset = game.FONT_GLYPHS.get(key) or game.font_charset()
+        baked[key] = bake_font(pygame.font.Font(source_path(font_path), font_size), charset)
+
+    entries = [(key, char, image) for key, (glyphs, _) in baked.items() for char, (image, _, _) in glyphs.items()]
+    # Tallest first keeps the shelves tight
+    entries.sort(key=lambda entry: -entry[2].get_height())
+    positions, atlas_height = pack_shelves([image.get_size() for _, _, image in entries], atlas_width)
+
+    atlas = pygame.Surface((atlas_width, atlas_height), pygame.SRCALPHA)
+    fonts = {}
+    for key, (font_path, font_size, _) in game.FONT_CONFIG.items():
+        fonts[key] = dict(baked[key][1], source=[font_path, font_size], glyphs={})
+    for (key, char, image), (x, y) in zip(entries, positions):
+        atlas.blit(image, (x, y))
+        _, (offset_x, offset_y), advance = baked[key][0][char]
+        fonts[key]['glyphs'][char] = [x, y, image.get_width(), image.get_height(), offset_x, offset_y, advance]
+
+    pygame.image.save(atlas, atlas_target)
+    with open(metrics_target, 'w', encoding='utf-8') as f:
+        json.dump({'version': game.FONT_ATLAS_VERSION, 'fonts': fonts}, f, ensure_ascii=False, separators=(',', ':'))
+    glyph_count = sum(len(font['glyphs']) for font in fonts.values())
+    source_bytes = sum(os.path.getsize(source_path(path)) for path in {game.FONT_PATH, game.FONT_PATH_2})
+    print(f"{atlas_target}: {atlas_width}x{atlas_height}, {glyph_count} glyphs in {len(fonts)} fonts, "
+          f"{os.path.getsize(atlas_target) + os.path.getsize(metrics_target)} bytes with metrics "
+          f"(from {source_bytes} bytes of TTF)", file=sys.stderr)
+
+
+def pack_bundle(names, bundle_dir):
+    """Packs the named assets into one content-hashed bundle in bundle_dir; returns its manifest entry."""
+    assets, blobs, offset = {}, [], 0
+    for name in names:
+        with open(source_path(name), 'rb') as f:
+            data = f.read()
+        packed = zlib.compress(data, 9)
+        # PNGs and the cover asset are compressed already, those are stored as they are
+        compressed = len(packed) < len(data)
+        blob = packed if compressed else data
+        assets[name] = {
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'offset': offset,
+            'length': len(blob),
+            'size': len(data),
+            'compressed': compressed,
+        }
+        blobs.append(blob)
+        offset += len(blob)
+    bundle = b''.join(blobs)
+    bundle_path = os.path.join(bundle_dir, f"{hashlib.sha256(bundle).hexdigest()[:16]}.bundle")
+    with open(bundle_path, 'wb') as f:
+        f.write(bundle)
+    loose_bytes = sum(entry['size'] for entry in assets.values())
+    print(f"{bundle_path}: {len(assets)} assets, {len(bundle)} bytes (from {loose_bytes} bytes)", file=sys.stderr)
+    return {'bundle': f"assets/{os.path.basename(bundle_path)}", 'assets': assets}
+
+
+def build_bundle(target_dir):
+    bundle_dir = os.path.join(target_dir, 'assets')
+    os.makedirs(bundle_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(bundle_dir, '*.bundle')):
+        os.remove(stale)
+    boot = pack_bundle(game.BOOT_ASSETS, bundle_dir)
+    deferred = pack_bundle(game.DEFERRED_ASSETS, bundle_dir)
+    # For the loose-file fallback, which on the web can't read them from the app archive, and
+    # the TTFs, fetched one by one if a font needs a glyph that isn't in the atlas
+    for name in game.BUNDLED_ASSETS + game.ON_DEMAND_ASSETS:
+        shutil.copyfile(source_path(name), os.path.join(target_dir, name))
+    with open(os.path.join(target_dir, game.ASSET_MANIFEST), 'w') as f:
+        json.dump({'version': game.ASSET_BUNDLE_VERSION, 'boot': boot, 'deferred': deferred}, f, indent=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-build RADIANT's runtime assets.")
+    parser.add_argument('--cover', default=source_path(game.COVER_IMAGE_PATH), help="source cover image")
+    parser.add_argument('--output', default=source_path(game.COVER_ASSET_PATH), help="pre-scaled cover asset")
+    parser.add_argument('--font-atlas', default=source_path(game.FONT_ATLAS_PATH), help="baked glyph atlas")
+    parser.add_argument('--font-metrics', default=source_path(game.FONT_METRICS_PATH),
+                        help="glyph rects and metrics for the atlas")
+    parser.add_argument('--bundle-dir', default=os.path.join(ROOT, game.ASSET_BUNDLE_DIR),
+                        help="where the asset bundles and their manifest go")
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))  # convert() needs a display surface
+    pygame.font.init()
+    build_cover(args.cover, args.output)
+    build_fonts(args.font_atlas, args.font_metrics)
+    build_bundle(args.bundle_dir)
+
+
+if __name__ == '__main__':
+    main()